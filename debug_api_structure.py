@@ -6,6 +6,7 @@ import asyncio
 import sys
 import lighter
 import json
+from src.utils.event_loop import install_uvloop
 
 async def debug_api_structure():
     """调试API响应的数据结构"""
@@ -79,7 +80,7 @@ async def debug_api_structure():
             
             # 方法3: 尝试其他API方法
             print("3. 尝试其他可能的API方法:")
-            api_methods = [method for method in dir(order_api) if not method.startswith('_') and callable(getattr(order_api, method))]
+            api_methods = sorted(name for name, attr in vars(type(order_api)).items() if not name.startswith('_') and callable(attr))
             print(f"  可用方法: {api_methods}")
             
         except Exception as e:
@@ -91,4 +92,5 @@ async def debug_api_structure():
         print(f"初始化失败: {e}")
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(debug_api_structure())
\ No newline at end of file
@@ -3,9 +3,19 @@
 提取真实的市场精度配置
 """
 import asyncio
+import logging
+import os
 import sys
 import lighter
 import json
+from src.utils.event_loop import install_uvloop
+
+# 逐市场的对象结构转储只在LOG_LEVEL=DEBUG时输出
+logger = logging.getLogger(__name__)
+
+# 订单数量字段按优先级排列；_MISSING用于区分"字段不存在"和"字段值为None"
+_AMOUNT_FIELDS = ('remaining_base_amount', 'initial_base_amount')
+_MISSING = object()
 
 async def extract_real_precision():
     """提取真实的市场精度"""
@@ -30,8 +40,10 @@ async def extract_real_precision():
                     details = await order_api.order_book_details(market_id=market_index)
                     if details and hasattr(details, 'order_book_details'):
                         detail_data = details.order_book_details
-                        print(f"  order_book_details类型: {type(detail_data)}")
-                        print(f"  order_book_details属性: {dir(detail_data)}")
+                        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+                        if debug_enabled:
+                            logger.debug("  order_book_details类型: %s", type(detail_data))
+                            logger.debug("  order_book_details属性: %s", dir(detail_data))
                         
                         # 检查是否有市场信息
                         if hasattr(detail_data, 'market'):
@@ -41,11 +53,12 @@ async def extract_real_precision():
                             print(f"  从API获取 - price_decimals: {price_decimals}, size_decimals: {size_decimals}")
                         
                         # 尝试序列化查看完整结构
-                        try:
-                            detail_dict = detail_data.to_dict() if hasattr(detail_data, 'to_dict') else str(detail_data)
-                            print(f"  detail_data内容: {detail_dict}")
-                        except:
-                            pass
+                        if debug_enabled:
+                            try:
+                                detail_dict = detail_data.to_dict() if hasattr(detail_data, 'to_dict') else str(detail_data)
+                                logger.debug("  detail_data内容: %s", detail_dict)
+                            except:
+                                pass
                 except Exception as e:
                     print(f"  order_book_details错误: {e}")
                 
@@ -60,14 +73,16 @@ async def extract_real_precision():
                         amount_samples = []
                         
                         for order in bids + asks:
-                            if hasattr(order, 'price'):
-                                price_samples.append(str(order.price))
+                            price = getattr(order, 'price', _MISSING)
+                            if price is not _MISSING:
+                                price_samples.append(str(price))
                             
-                            # 检查数量字段
-                            if hasattr(order, 'remaining_base_amount'):
-                                amount_samples.append(str(order.remaining_base_amount))
-                            elif hasattr(order, 'initial_base_amount'):
-                                amount_samples.append(str(order.initial_base_amount))
+                            # 检查数量字段，每个字段只取一次属性
+                            for attr in _AMOUNT_FIELDS:
+                                amount = getattr(order, attr, _MISSING)
+                                if amount is not _MISSING:
+                                    amount_samples.append(str(amount))
+                                    break
                         
                         if price_samples:
                             # 分析价格精度
@@ -136,4 +151,6 @@ async def extract_real_precision():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(), format='%(message)s')
+    install_uvloop()
     asyncio.run(extract_real_precision())
\ No newline at end of file
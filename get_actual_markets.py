@@ -6,6 +6,7 @@ import asyncio
 import sys
 import lighter
 from datetime import datetime
+from src.utils.event_loop import install_uvloop
 
 async def get_actual_markets():
     """通过订单簿数据获取实际市场信息"""
@@ -26,10 +27,21 @@ async def get_actual_markets():
         print(f"{'Index':<8} {'Status':<12} {'Best Bid':<15} {'Best Ask':<15} {'Spread':<10} {'Analysis':<30}")
         print("-" * 100)
         
-        for market_index in range(1, 11):
+        # 各市场的订单簿请求互不依赖，并发发出，总耗时约为一次往返
+        market_indices = range(1, 11)
+        orderbooks = await asyncio.gather(
+            *(order_api.order_book_orders(market_id=market_index, limit=10) for market_index in market_indices),
+            return_exceptions=True
+        )
+        
+        # 表格行先收集，全部分析完后一次写出
+        rows = []
+        add_row = rows.append
+        for market_index, orderbook in zip(market_indices, orderbooks):
             try:
-                # 获取订单簿数据
-                orderbook = await order_api.order_book_orders(market_id=market_index, limit=10)
+                # 单个市场请求失败时沿用原有的错误输出
+                if isinstance(orderbook, Exception):
+                    raise orderbook
                 
                 if orderbook and hasattr(orderbook, 'bids') and hasattr(orderbook, 'asks'):
                     bids = orderbook.bids if orderbook.bids else []
@@ -56,18 +68,19 @@ async def get_actual_markets():
                             else:
                                 analysis = f"未知币种 (价格范围)"
                             
-                            print(f"{market_index:<8} {'ACTIVE':<12} {best_bid:<15.2f} {best_ask:<15.2f} {spread_pct:<10.3f}% {analysis:<30}")
+                            add_row(f"{market_index:<8} {'ACTIVE':<12} {best_bid:<15.2f} {best_ask:<15.2f} {spread_pct:<10.3f}% {analysis:<30}")
                         else:
-                            print(f"{market_index:<8} {'INVALID':<12} {'N/A':<15} {'N/A':<15} {'N/A':<10} {'价格数据异常':<30}")
+                            add_row(f"{market_index:<8} {'INVALID':<12} {'N/A':<15} {'N/A':<15} {'N/A':<10} {'价格数据异常':<30}")
                     else:
-                        print(f"{market_index:<8} {'EMPTY':<12} {'N/A':<15} {'N/A':<15} {'N/A':<10} {'订单簿为空':<30}")
+                        add_row(f"{market_index:<8} {'EMPTY':<12} {'N/A':<15} {'N/A':<15} {'N/A':<10} {'订单簿为空':<30}")
                 else:
-                    print(f"{market_index:<8} {'NO_ORDERS':<12} {'N/A':<15} {'N/A':<15} {'N/A':<10} {'无订单数据':<30}")
+                    add_row(f"{market_index:<8} {'NO_ORDERS':<12} {'N/A':<15} {'N/A':<15} {'N/A':<10} {'无订单数据':<30}")
                     
             except Exception as e:
                 error_msg = str(e)[:25] + "..." if len(str(e)) > 25 else str(e)
-                print(f"{market_index:<8} {'ERROR':<12} {'N/A':<15} {'N/A':<15} {'N/A':<10} {error_msg:<30}")
+                add_row(f"{market_index:<8} {'ERROR':<12} {'N/A':<15} {'N/A':<15} {'N/A':<10} {error_msg:<30}")
         
+        sys.stdout.write("\n".join(rows) + "\n")
         print("-" * 100)
         print("市场分析完成")
         print()
@@ -82,4 +95,5 @@ async def get_actual_markets():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(get_actual_markets())
\ No newline at end of file
@@ -6,6 +6,7 @@ import asyncio
 import sys
 import lighter
 import json
+from src.utils.event_loop import install_uvloop
 
 async def get_real_market_precision():
     """获取真实的市场精度配置"""
@@ -25,10 +26,21 @@ async def get_real_market_precision():
         print(f"{'Index':<6} {'Price':<12} {'Price Analysis':<25} {'Size Analysis':<25} {'Suggested Precision':<25}")
         print("-" * 120)
         
-        for market_index in range(1, 11):
+        # 各市场的订单簿请求互不依赖，并发发出，总耗时约为一次往返
+        market_indices = range(1, 11)
+        orderbooks = await asyncio.gather(
+            *(order_api.order_book_orders(market_id=market_index, limit=20) for market_index in market_indices),
+            return_exceptions=True
+        )
+        
+        # 表格行先收集，全部分析完后一次写出
+        rows = []
+        add_row = rows.append
+        for market_index, orderbook in zip(market_indices, orderbooks):
             try:
-                # 获取订单簿数据
-                orderbook = await order_api.order_book_orders(market_id=market_index, limit=20)
+                # 单个市场请求失败时沿用原有的错误输出
+                if isinstance(orderbook, Exception):
+                    raise orderbook
                 
                 if orderbook and hasattr(orderbook, 'bids') and hasattr(orderbook, 'asks'):
                     bids = orderbook.bids if orderbook.bids else []
@@ -74,18 +86,19 @@ async def get_real_market_precision():
                             
                             suggested_precision = f"({price_decimals},{size_decimals},{price_multiplier},{size_multiplier})"
                             
-                            print(f"{market_index:<6} {price_range:<12} {'精度:'+str(price_decimals)+'位':<25} {'精度:'+str(size_decimals)+'位':<25} {suggested_precision:<25}")
+                            add_row(f"{market_index:<6} {price_range:<12} {'精度:'+str(price_decimals)+'位':<25} {'精度:'+str(size_decimals)+'位':<25} {suggested_precision:<25}")
                         else:
-                            print(f"{market_index:<6} {'N/A':<12} {'无数据':<25} {'无数据':<25} {'无法确定':<25}")
+                            add_row(f"{market_index:<6} {'N/A':<12} {'无数据':<25} {'无数据':<25} {'无法确定':<25}")
                     else:
-                        print(f"{market_index:<6} {'N/A':<12} {'订单簿为空':<25} {'订单簿为空':<25} {'无法确定':<25}")
+                        add_row(f"{market_index:<6} {'N/A':<12} {'订单簿为空':<25} {'订单簿为空':<25} {'无法确定':<25}")
                 else:
-                    print(f"{market_index:<6} {'N/A':<12} {'无订单数据':<25} {'无订单数据':<25} {'无法确定':<25}")
+                    add_row(f"{market_index:<6} {'N/A':<12} {'无订单数据':<25} {'无订单数据':<25} {'无法确定':<25}")
                     
             except Exception as e:
                 error_msg = str(e)[:20] + "..." if len(str(e)) > 20 else str(e)
-                print(f"{market_index:<6} {'ERROR':<12} {error_msg:<25} {'':<25} {'查询失败':<25}")
+                add_row(f"{market_index:<6} {'ERROR':<12} {error_msg:<25} {'':<25} {'查询失败':<25}")
         
+        sys.stdout.write("\n".join(rows) + "\n")
         print("-" * 120)
         print()
         print("建议的精度配置更新:")
@@ -97,4 +110,5 @@ async def get_real_market_precision():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(get_real_market_precision())
\ No newline at end of file
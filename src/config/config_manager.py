@@ -4,7 +4,7 @@ Configuration Manager for Lighter Hedge Trading System
 
 import yaml
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import structlog
 from src.models import (
@@ -15,6 +15,10 @@ from decimal import Decimal
 
 logger = structlog.get_logger()
 
+# 进程内已解析配置的缓存：{配置文件绝对路径: (文件mtime_ns, 解析结果)}
+# 配置中含私钥，只缓存在内存中，不落盘
+_PARSED_CONFIG_CACHE: Dict[str, Tuple[int, ConfigModel]] = {}
+
 
 class ConfigManager:
     """Manages system configuration loading and validation"""
@@ -40,6 +44,15 @@ class ConfigManager:
             if not config_file.exists():
                 raise FileNotFoundError(f"配置文件不存在: {self.config_path}")
             
+            # 文件未修改时直接复用上次解析的结果，跳过YAML解析和模型构建
+            cache_key = str(config_file.resolve())
+            mtime_ns = config_file.stat().st_mtime_ns
+            cached = _PARSED_CONFIG_CACHE.get(cache_key)
+            if cached is not None and cached[0] == mtime_ns:
+                self.config = cached[1]
+                logger.debug("配置文件未变化，复用已解析的配置", config_path=self.config_path)
+                return
+            
             with open(config_file, 'r', encoding='utf-8') as f:
                 raw_config = yaml.safe_load(f)
             
@@ -108,6 +121,7 @@ class ConfigManager:
                 accounts=accounts,
                 trading_pairs=trading_pairs
             )
+            _PARSED_CONFIG_CACHE[cache_key] = (mtime_ns, self.config)
             
             logger.info("配置文件加载完成", 
                        accounts_count=len(accounts),
@@ -3,6 +3,7 @@ Hedge Trading Engine for Lighter Protocol
 """
 
 import asyncio
+import logging
 from typing import Dict, List, Optional, Set
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -44,6 +45,8 @@ class HedgeTradingEngine:
         self.is_running = False
         self.active_positions: Dict[str, HedgePosition] = {}
         self.trading_pairs: Dict[str, TradingPairConfig] = {}
+        # market_index -> 交易对列表，行情回调按市场直接查找，无需逐个扫描交易对
+        self._pairs_by_market: Dict[int, List[TradingPairConfig]] = {}
         self.last_trade_times: Dict[str, datetime] = {}
         
         # 统一仓位问题检测跟踪器（包括不一致和数量不平衡）
@@ -96,6 +99,10 @@ class HedgeTradingEngine:
                        pair_id=pair.id,
                        name=pair.name,
                        market_index=pair.market_index)
+        
+        self._pairs_by_market = {}
+        for pair in self.trading_pairs.values():
+            self._pairs_by_market.setdefault(pair.market_index, []).append(pair)
     
     async def start(self) -> None:
         """Start the trading engine"""
@@ -2123,16 +2130,17 @@ class HedgeTradingEngine:
                 self.balanced_hedge_strategy.update_market_data(market_data)
             
             # Log price updates for active pairs
-            active_pairs = [p for p in self.trading_pairs.values() 
-                          if p.market_index == market_data.market_index]
+            active_pairs = self._pairs_by_market.get(market_data.market_index, ())
             
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
             for pair in active_pairs:
-                logger.debug("实时价格更新",
-                           pair_id=pair.id,
-                           market_index=market_data.market_index,
-                           price=float(market_data.price),
-                           bid=float(market_data.bid_price) if market_data.bid_price else None,
-                           ask=float(market_data.ask_price) if market_data.ask_price else None)
+                if debug_enabled:
+                    logger.debug("实时价格更新",
+                               pair_id=pair.id,
+                               market_index=market_data.market_index,
+                               price=market_data.price,
+                               bid=market_data.bid_price,
+                               ask=market_data.ask_price)
                 
                 # Check if any active positions need attention
                 pair_positions = [p for p in self.active_positions.values()
@@ -2159,14 +2167,15 @@ class HedgeTradingEngine:
                 self.balanced_hedge_strategy.update_orderbook(orderbook)
             
             # Log orderbook updates for debugging
-            best_bid = orderbook.bids[0]['price'] if orderbook.bids else None
-            best_ask = orderbook.asks[0]['price'] if orderbook.asks else None
-            
-            logger.debug("订单簿更新",
-                        market_index=orderbook.market_index,
-                        best_bid=float(best_bid) if best_bid else None,
-                        best_ask=float(best_ask) if best_ask else None,
-                        spread=float(best_ask - best_bid) if best_bid and best_ask else None)
+            if logger.isEnabledFor(logging.DEBUG):
+                best_bid = orderbook.bids[0]['price'] if orderbook.bids else None
+                best_ask = orderbook.asks[0]['price'] if orderbook.asks else None
+                
+                logger.debug("订单簿更新",
+                            market_index=orderbook.market_index,
+                            best_bid=best_bid,
+                            best_ask=best_ask,
+                            spread=best_ask - best_bid if best_bid and best_ask else None)
                 
         except Exception as e:
             logger.error("处理订单簿更新失败",
@@ -2184,14 +2193,20 @@ class HedgeTradingEngine:
             if hasattr(self.account_manager, 'update_account_data'):
                 self.account_manager.update_account_data(account_index, account_data)
             
+            # Update strategy position cache when the update carries positions
+            positions = account_data.get('positions')
+            if positions is not None and hasattr(self.balanced_hedge_strategy, 'update_positions'):
+                self.balanced_hedge_strategy.update_positions(account_index, positions)
+            
             # Log account updates
             balance = account_data.get('balance')
             available_balance = account_data.get('available_balance')
             
-            logger.debug("账户实时更新",
-                        account_index=account_index,
-                        balance=float(balance) if balance else None,
-                        available_balance=float(available_balance) if available_balance else None)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("账户实时更新",
+                            account_index=account_index,
+                            balance=balance,
+                            available_balance=available_balance)
             
             # Check for margin calls or low balance warnings
             if balance and float(balance) < 100:  # Low balance threshold
@@ -5,7 +5,7 @@ Lighter Client Factory - 基于官方示例的客户端工厂
 
 import lighter
 import asyncio
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 import structlog
 from src.config.config_manager import ConfigManager
 
@@ -21,6 +21,16 @@ class LighterClientFactory:
         self._configuration: Optional[lighter.Configuration] = None
         self._signer_clients: Dict[int, lighter.SignerClient] = {}
         self._ws_client: Optional[lighter.WsClient] = None
+        # 各类API对象都包装同一个ApiClient（共享HTTP连接池），按类型只创建一次
+        self._apis: Dict[type, Any] = {}
+    
+    async def __aenter__(self) -> "LighterClientFactory":
+        """支持async with用法，退出时自动清理"""
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """退出上下文时清理所有客户端和连接"""
+        await self.cleanup()
         
     def get_configuration(self) -> lighter.Configuration:
         """获取配置对象"""
@@ -32,6 +42,9 @@ class LighterClientFactory:
             global_config = self.config_manager.get_global_config()
             if 'timeout' in global_config:
                 self._configuration.timeout = global_config['timeout']
+            # HTTP连接池大小，所有账户共享同一个API客户端的连接
+            if 'connection_pool_maxsize' in global_config:
+                self._configuration.connection_pool_maxsize = global_config['connection_pool_maxsize']
                 
         return self._configuration
     
@@ -44,25 +57,33 @@ class LighterClientFactory:
             
         return self._api_client
     
+    def _get_api(self, api_cls: type) -> Any:
+        """获取共享ApiClient上的API对象，首次调用时创建"""
+        api = self._apis.get(api_cls)
+        if api is None:
+            api = api_cls(self.get_api_client())
+            self._apis[api_cls] = api
+        return api
+    
     def get_account_api(self) -> lighter.AccountApi:
         """获取账户API"""
-        return lighter.AccountApi(self.get_api_client())
+        return self._get_api(lighter.AccountApi)
     
     def get_order_api(self) -> lighter.OrderApi:
         """获取订单API"""
-        return lighter.OrderApi(self.get_api_client())
+        return self._get_api(lighter.OrderApi)
     
     def get_info_api(self) -> lighter.InfoApi:
         """获取信息API"""
-        return lighter.InfoApi(self.get_api_client())
+        return self._get_api(lighter.InfoApi)
     
     def get_block_api(self) -> lighter.BlockApi:
         """获取区块API"""
-        return lighter.BlockApi(self.get_api_client())
+        return self._get_api(lighter.BlockApi)
     
     def get_candlestick_api(self) -> lighter.CandlestickApi:
         """获取蜡烛图API"""
-        return lighter.CandlestickApi(self.get_api_client())
+        return self._get_api(lighter.CandlestickApi)
     
     async def get_signer_client(self, account_index: int) -> Optional[lighter.SignerClient]:
         """获取签名客户端（支持重试和完善的错误处理）"""
@@ -340,6 +361,7 @@ class LighterClientFactory:
             
             self._api_client = None
             self._configuration = None
+            self._apis.clear()
             
             logger.info("客户端工厂清理完成")
             
@@ -7,7 +7,7 @@ import signal
 import sys
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 import click
 import structlog
 
@@ -30,10 +30,15 @@ if sys.platform == "win32":
     if hasattr(sys.stderr, 'reconfigure'):
         sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
+from src.utils.event_loop import install_uvloop
 from src.utils.logger import setup_logging, get_logger
 from src.config.config_manager import ConfigManager
-from src.core.hedge_trading_engine import HedgeTradingEngine
-from src.web.web_server import WebServer
+
+# 交易引擎和Web服务器会引入lighter SDK、FastAPI等重量级依赖，
+# 延迟到Application.initialize中导入，--help/init/validate等命令无需加载
+if TYPE_CHECKING:
+    from src.core.hedge_trading_engine import HedgeTradingEngine
+    from src.web.web_server import WebServer
 
 logger = get_logger()
 
@@ -44,8 +49,8 @@ class Application:
     def __init__(self, config_path: Optional[str] = None):
         self.config_path = config_path or "config/config.yaml"
         self.config_manager: Optional[ConfigManager] = None
-        self.trading_engine: Optional[HedgeTradingEngine] = None
-        self.web_server: Optional[WebServer] = None
+        self.trading_engine: Optional['HedgeTradingEngine'] = None
+        self.web_server: Optional['WebServer'] = None
         self.shutdown_event = asyncio.Event()
         
     async def initialize(self) -> None:
@@ -59,6 +64,7 @@ class Application:
             logger.info("[成功] 配置管理器初始化完成")
             
             # Initialize trading engine
+            from src.core.hedge_trading_engine import HedgeTradingEngine
             self.trading_engine = HedgeTradingEngine(self.config_manager)
             await self.trading_engine.initialize()
             logger.info("[成功] 交易引擎初始化完成")
@@ -66,6 +72,7 @@ class Application:
             # Initialize web server
             web_config = self.config_manager.get_web_config()
             if web_config.get('enable_web_interface', True):
+                from src.web.web_server import WebServer
                 self.web_server = WebServer(
                     self.config_manager,
                     self.trading_engine
@@ -191,6 +198,7 @@ def start(ctx):
         sys.exit(1)
     
     # Create and run application
+    install_uvloop()
     app = Application(config_path)
     app.setup_signal_handlers()
     
@@ -241,6 +249,7 @@ def validate(ctx):
             click.echo(f"[错误] 配置验证失败: {e}")
             sys.exit(1)
     
+    install_uvloop()
     asyncio.run(validate_config())
 
 
@@ -275,6 +284,7 @@ def test_connection(ctx):
             click.echo(f"[错误] 连接测试失败: {e}")
             sys.exit(1)
     
+    install_uvloop()
     asyncio.run(test_conn())
 
 
@@ -9,6 +9,11 @@ from pydantic import BaseModel, Field
 from decimal import Decimal
 
 
+# 交易所仓位对象的候选字段名（按优先级），账户管理器和策略解析SDK仓位时共用
+POSITION_MARKET_FIELDS = ('market_index', 'market_id', 'market', 'marketIndex')
+POSITION_SIZE_FALLBACK_FIELDS = ('position_value', 'allocated_margin', 'size', 'amount')
+
+
 class PositionStatus(str, Enum):
     """Position status enumeration"""
     OPENING = "opening"
@@ -180,6 +185,8 @@ class HedgePosition(BaseModel):
     created_at: datetime
     updated_at: datetime
     closed_at: Optional[datetime] = None
+    stop_loss_price: Optional[Decimal] = None
+    take_profit_price: Optional[Decimal] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
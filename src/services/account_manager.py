@@ -3,18 +3,25 @@ Account Manager for Lighter Hedge Trading System
 """
 
 import asyncio
+import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
 import structlog
 
 import lighter
-from src.models import Account, AccountConfig, Position
+from src.models import (
+    Account, AccountConfig, Position,
+    POSITION_MARKET_FIELDS, POSITION_SIZE_FALLBACK_FIELDS
+)
 from src.config.config_manager import ConfigManager
 from src.core.lighter_client_factory import get_client_factory
 
 logger = structlog.get_logger()
 
+# 调试日志中展示的全部大小相关字段
+_POSITION_SIZE_DEBUG_FIELDS = ('position', 'position_value', 'sign', 'allocated_margin', 'size', 'amount')
+
 
 class AccountManager:
     """Manages account information and operations"""
@@ -88,54 +95,61 @@ class AccountManager:
     async def _update_account_index_in_config(self, l1_address: str, new_index: int) -> None:
         """更新配置文件中的账户index（可选功能）"""
         try:
-            import yaml
-            from pathlib import Path
-            
-            config_path = Path(self.config_manager.config_path)
-            if not config_path.exists():
-                logger.warning("配置文件不存在，无法更新index", config_path=str(config_path))
-                return
-            
-            # 读取当前配置
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config_data = yaml.safe_load(f)
-            
-            # 查找并更新对应账户的index
-            updated = False
-            if 'accounts' in config_data:
-                for account in config_data['accounts']:
-                    if account.get('l1_address', '').lower() == l1_address.lower():
-                        old_index = account.get('index', 0)
-                        account['index'] = new_index
-                        updated = True
-                        logger.info("配置文件中的账户index已更新", 
-                                   l1_address=l1_address,
-                                   old_index=old_index,
-                                   new_index=new_index)
-                        break
-            
-            # 保存更新后的配置
-            if updated:
-                # 创建备份
-                backup_path = config_path.with_suffix('.yaml.backup')
-                config_path.replace(backup_path)
-                
-                # 写入新配置
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    yaml.dump(config_data, f, default_flow_style=False, 
-                             allow_unicode=True, sort_keys=False)
-                
-                logger.info("配置文件已更新并创建备份", 
-                           config_path=str(config_path),
-                           backup_path=str(backup_path))
-            else:
-                logger.warning("未找到匹配的账户地址，无法更新配置", l1_address=l1_address)
-                
+            # 文件读写和YAML解析是阻塞操作，放到线程池执行以免阻塞事件循环
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None, self._rewrite_account_index_in_config, l1_address, new_index
+            )
         except Exception as e:
             logger.error("更新配置文件中的账户index失败", 
                         l1_address=l1_address, 
                         new_index=new_index,
                         error=str(e))
+    
+    def _rewrite_account_index_in_config(self, l1_address: str, new_index: int) -> None:
+        """同步读取、修改并写回配置文件中的账户index"""
+        import yaml
+        from pathlib import Path
+        
+        config_path = Path(self.config_manager.config_path)
+        if not config_path.exists():
+            logger.warning("配置文件不存在，无法更新index", config_path=str(config_path))
+            return
+        
+        # 读取当前配置
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config_data = yaml.safe_load(f)
+        
+        # 查找并更新对应账户的index
+        updated = False
+        if 'accounts' in config_data:
+            for account in config_data['accounts']:
+                if account.get('l1_address', '').lower() == l1_address.lower():
+                    old_index = account.get('index', 0)
+                    account['index'] = new_index
+                    updated = True
+                    logger.info("配置文件中的账户index已更新", 
+                               l1_address=l1_address,
+                               old_index=old_index,
+                               new_index=new_index)
+                    break
+        
+        # 保存更新后的配置
+        if updated:
+            # 创建备份
+            backup_path = config_path.with_suffix('.yaml.backup')
+            config_path.replace(backup_path)
+            
+            # 写入新配置
+            with open(config_path, 'w', encoding='utf-8') as f:
+                yaml.dump(config_data, f, default_flow_style=False, 
+                         allow_unicode=True, sort_keys=False)
+            
+            logger.info("配置文件已更新并创建备份", 
+                       config_path=str(config_path),
+                       backup_path=str(backup_path))
+        else:
+            logger.warning("未找到匹配的账户地址，无法更新配置", l1_address=l1_address)
         
     async def initialize(self) -> None:
         """Initialize account manager"""
@@ -224,44 +238,44 @@ class AccountManager:
             # Get positions - handle official API response structure
             positions = []
             if hasattr(account_data, 'positions') and account_data.positions:
+                debug_enabled = logger.isEnabledFor(logging.DEBUG)
                 for pos_data in account_data.positions:
                     # 详细调试位置数据字段
-                    pos_attrs = [attr for attr in dir(pos_data) if not attr.startswith('_')]
-                    logger.debug("🔍 仓位数据字段分析",
-                               account_index=config.index,
-                               pos_attrs=pos_attrs[:15],  # 限制输出长度
-                               pos_type=type(pos_data).__name__)
+                    if debug_enabled:
+                        pos_attrs = [attr for attr in dir(pos_data) if not attr.startswith('_')]
+                        logger.debug("🔍 仓位数据字段分析",
+                                   account_index=config.index,
+                                   pos_attrs=pos_attrs[:15],  # 限制输出长度
+                                   pos_type=type(pos_data).__name__)
                     
                     # 尝试多种可能的市场索引字段名
                     market_index = 0  # 默认值
-                    for field_name in ['market_index', 'market_id', 'market', 'marketIndex']:
+                    for field_name in POSITION_MARKET_FIELDS:
                         if hasattr(pos_data, field_name):
                             field_value = getattr(pos_data, field_name)
-                            logger.debug("🎯 找到市场字段",
-                                       field_name=field_name,
-                                       field_value=field_value,
-                                       field_type=type(field_value).__name__)
+                            if debug_enabled:
+                                logger.debug("🎯 找到市场字段",
+                                           field_name=field_name,
+                                           field_value=field_value,
+                                           field_type=type(field_value).__name__)
                             if field_value is not None:
                                 market_index = int(field_value)
                                 break
                     
-                    # 检查所有可能的仓位大小字段
-                    size_value = None
-                    size_field_used = None
-                    
                     # 先显示所有可能的大小字段值
-                    size_fields_analysis = {}
-                    for size_field in ['position', 'position_value', 'sign', 'allocated_margin', 'size', 'amount']:
-                        if hasattr(pos_data, size_field):
-                            potential_size = getattr(pos_data, size_field)
-                            size_fields_analysis[size_field] = {
-                                'value': potential_size,
-                                'type': type(potential_size).__name__
-                            }
-                    
-                    logger.debug("🔍 所有大小字段检查",
-                               account_index=config.index,
-                               size_fields=size_fields_analysis)
+                    if debug_enabled:
+                        size_fields_analysis = {}
+                        for size_field in _POSITION_SIZE_DEBUG_FIELDS:
+                            if hasattr(pos_data, size_field):
+                                potential_size = getattr(pos_data, size_field)
+                                size_fields_analysis[size_field] = {
+                                    'value': potential_size,
+                                    'type': type(potential_size).__name__
+                                }
+                        
+                        logger.debug("🔍 所有大小字段检查",
+                                   account_index=config.index,
+                                   size_fields=size_fields_analysis)
                     
                     # 根据官方文档，Lighter Protocol使用position字段作为仓位大小
                     size_value = None
@@ -285,7 +299,7 @@ class AccountManager:
                     
                     # 如果没有position字段，尝试其他可能的字段
                     if size_value is None or size_value == 0:
-                        for size_field in ['position_value', 'allocated_margin', 'size', 'amount']:
+                        for size_field in POSITION_SIZE_FALLBACK_FIELDS:
                             if hasattr(pos_data, size_field):
                                 potential_size = getattr(pos_data, size_field)
                                 if potential_size is not None:
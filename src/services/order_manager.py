@@ -3,9 +3,10 @@ Order Manager for Lighter Hedge Trading System
 """
 
 import asyncio
+import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_EVEN
 import structlog
 
 import lighter
@@ -16,6 +17,24 @@ from src.core.lighter_client_factory import get_client_factory
 logger = structlog.get_logger()
 
 
+def _scale_price(price: Decimal, price_multiplier: int) -> int:
+    """把价格换算为交易所整数价格单位，按最近值（银行家舍入）取整而不是向零截断"""
+    return int((price * price_multiplier).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+# 交易对名称推断精度的规则：(名称匹配, ID匹配, 精度配置)，按顺序取第一个命中项
+_PAIR_PRECISION_RULES = (
+    (re.compile(r'btc|bitcoin'), re.compile(r'btc'), (1, 5, 10, 100000)),      # BTC - 真实精度
+    (re.compile(r'eth|ethereum'), re.compile(r'eth'), (2, 4, 100, 10000)),     # ETH - 预估精度（目前无ETH市场）
+    (re.compile(r'sol|solana'), re.compile(r'sol'), (3, 3, 1000, 1000)),       # SOL - 真实精度（修复）
+    (re.compile(r'doge'), re.compile(r'doge'), (6, 0, 1000000, 1)),            # DOGE - 真实精度
+    (re.compile(r'pepe'), re.compile(r'pepe'), (6, 0, 1000000, 1)),            # PEPE - 真实精度
+    (re.compile(r'wif'), re.compile(r'wif'), (5, 1, 100000, 10)),              # WIF - 真实精度
+    (re.compile(r'usdc'), re.compile(r'usdc'), (4, 2, 10000, 100)),            # USDC - 预估精度
+    (re.compile(r'usdt'), re.compile(r'usdt'), (4, 2, 10000, 100)),            # USDT - 预估精度
+)
+
+
 class OrderManager:
     """Manages order creation, monitoring, and execution"""
     
@@ -29,6 +48,9 @@ class OrderManager:
         self.signer_clients: Dict[int, lighter.SignerClient] = {}
         self._monitoring_task: Optional[asyncio.Task] = None
         
+        # 订单进入终态（成交/取消/失败）时触发的事件，供调用方等待成交确认
+        self._order_done_events: Dict[str, asyncio.Event] = {}
+        
         # 缓存所有可能的市场ID
         self._cached_market_ids: Optional[List[int]] = None
         
@@ -233,7 +255,7 @@ class OrderManager:
         """Initialize signer clients for accounts using factory"""
         accounts = self.config_manager.get_active_accounts()
         
-        for account in accounts:
+        async def _init_one(account) -> None:
             try:
                 # Use client factory to create signer client
                 signer_client = await self.client_factory.get_signer_client(account.index)
@@ -251,6 +273,9 @@ class OrderManager:
                            account_index=account.index,
                            error=str(e))
                 # Continue with other accounts
+        
+        # 各账户的SignerClient互不依赖，并发创建以缩短启动时间
+        await asyncio.gather(*(_init_one(account) for account in accounts))
     
     def has_signer_clients(self) -> bool:
         """检查是否有可用的SignerClient"""
@@ -818,28 +843,38 @@ class OrderManager:
         name_lower = pair_name.lower()
         id_lower = pair_id.lower()
         
-        if 'btc' in name_lower or 'btc' in id_lower or 'bitcoin' in name_lower:
-            return (1, 5, 10, 100000)  # BTC - 真实精度
-        elif 'eth' in name_lower or 'eth' in id_lower or 'ethereum' in name_lower:
-            return (2, 4, 100, 10000)  # ETH - 预估精度（目前无ETH市场）
-        elif 'sol' in name_lower or 'sol' in id_lower or 'solana' in name_lower:
-            return (3, 3, 1000, 1000)  # SOL - 真实精度（修复）
-        elif 'doge' in name_lower or 'doge' in id_lower:
-            return (6, 0, 1000000, 1)  # DOGE - 真实精度
-        elif 'pepe' in name_lower or 'pepe' in id_lower:
-            return (6, 0, 1000000, 1)  # PEPE - 真实精度
-        elif 'wif' in name_lower or 'wif' in id_lower:
-            return (5, 1, 100000, 10)  # WIF - 真实精度
-        elif 'usdc' in name_lower or 'usdc' in id_lower:
-            return (4, 2, 10000, 100)  # USDC - 预估精度
-        elif 'usdt' in name_lower or 'usdt' in id_lower:
-            return (4, 2, 10000, 100)  # USDT - 预估精度
-        else:
-            # 默认使用中等精度配置
-            logger.warning("无法识别交易对类型，使用默认精度",
-                         pair_name=pair_name,
-                         pair_id=pair_id)
-            return (2, 4, 100, 10000)  # 类似ETH的配置
+        for name_re, id_re, precision in _PAIR_PRECISION_RULES:
+            if name_re.search(name_lower) or id_re.search(id_lower):
+                return precision
+        
+        # 默认使用中等精度配置
+        logger.warning("无法识别交易对类型，使用默认精度",
+                     pair_name=pair_name,
+                     pair_id=pair_id)
+        return (2, 4, 100, 10000)  # 类似ETH的配置
+    
+    async def wait_fill(self, order_id: str, timeout: float = 2.0) -> bool:
+        """等待订单进入终态（成交/取消/失败），返回是否成交；超时返回False"""
+        order = self.orders.get(order_id)
+        if order and order.status != OrderStatus.PENDING:
+            return order.status == OrderStatus.FILLED
+        
+        event = self._order_done_events.setdefault(order_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._order_done_events.pop(order_id, None)
+        
+        order = self.orders.get(order_id)
+        return bool(order and order.status == OrderStatus.FILLED)
+    
+    def _notify_order_done(self, order_id: str) -> None:
+        """订单进入终态时唤醒等待者"""
+        event = self._order_done_events.get(order_id)
+        if event:
+            event.set()
     
     async def get_order_status(self, order_id: str) -> Optional[OrderStatus]:
         """Get order status"""
@@ -875,7 +910,7 @@ class OrderManager:
             # 动态获取市场精度
             price_decimals, size_decimals, price_multiplier, size_multiplier = await self._get_market_precision(market_index)
             base_amount = int(amount * size_multiplier)
-            trigger_price_int = int(trigger_price * price_multiplier)
+            trigger_price_int = _scale_price(trigger_price, price_multiplier)
             
             logger.debug("止损单市场精度转换",
                        market_index=market_index,
@@ -982,7 +1017,7 @@ class OrderManager:
             # 动态获取市场精度
             price_decimals, size_decimals, price_multiplier, size_multiplier = await self._get_market_precision(market_index)
             base_amount = int(amount * size_multiplier)
-            trigger_price_int = int(trigger_price * price_multiplier)
+            trigger_price_int = _scale_price(trigger_price, price_multiplier)
             
             logger.debug("止盈单市场精度转换",
                        market_index=market_index,
@@ -1107,6 +1142,28 @@ class OrderManager:
                         error=str(e))
             return False
 
+    async def cancel_orders(
+        self,
+        account_index: int,
+        market_index: int,
+        order_indexes: List[int]
+    ) -> int:
+        """Cancel several orders of one market, returns the number actually cancelled"""
+        if not order_indexes:
+            return 0
+        
+        signer_client = self.signer_clients.get(account_index)
+        if not signer_client:
+            logger.error("SignerClient未初始化", account_index=account_index)
+            return 0
+        
+        # 同一账户的签名交易共用nonce序列，逐笔顺序提交，不并发签名
+        cancelled_count = 0
+        for order_index in order_indexes:
+            if await self.cancel_order(account_index, market_index, order_index):
+                cancelled_count += 1
+        return cancelled_count
+
     async def cancel_all_inactive_orders(
         self,
         account_index: int,
@@ -1132,57 +1189,28 @@ class OrderManager:
                            market_index=market_index)
                 return 0
             
-            all_inactive_orders = inactive_orders_data.orders
-            
-            cancelled_count = 0
-            
-            # Cancel each inactive order
+            # 按市场归集待取消的订单，再交给批量取消一次性处理
+            orders_by_market: Dict[int, List[int]] = {}
             for order in inactive_orders_data.orders:
-                try:
-                    # Extract order details
-                    order_market_index = getattr(order, 'market_index', getattr(order, 'market_id', None))
-                    order_index = getattr(order, 'order_index', getattr(order, 'id', None))
-                    
-                    if order_market_index is None or order_index is None:
-                        logger.warning("订单信息不完整，跳过取消",
-                                     order_data=str(order)[:200])
-                        continue
-                    
-                    # Skip if filtering by market and this order is for different market
-                    if market_index is not None and order_market_index != market_index:
-                        continue
-                    
-                    # Cancel the order
-                    result = await signer_client.cancel_order(
-                        market_index=order_market_index,
-                        order_index=order_index
-                    )
-                    
-                    tx, tx_hash, err = self._parse_sdk_result(result, "批量取消订单")
-                    
-                    if not err:
-                        cancelled_count += 1
-                        logger.info("历史订单已取消",
-                                   account_index=account_index,
-                                   market_index=order_market_index,
-                                   order_index=order_index,
-                                   tx_hash=tx_hash)
-                    else:
-                        logger.warning("取消历史订单失败",
-                                     account_index=account_index,
-                                     market_index=order_market_index,
-                                     order_index=order_index,
-                                     error=err)
-                    
-                    # Small delay to avoid overwhelming the API
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as order_error:
-                    logger.error("取消单个订单时发生异常",
-                               account_index=account_index,
-                               order_data=str(order)[:200],
-                               error=str(order_error))
+                order_market_index = getattr(order, 'market_index', getattr(order, 'market_id', None))
+                order_index = getattr(order, 'order_index', getattr(order, 'id', None))
+                
+                if order_market_index is None or order_index is None:
+                    logger.warning("订单信息不完整，跳过取消",
+                                 order_data=str(order)[:200])
+                    continue
+                
+                # Skip if filtering by market and this order is for different market
+                if market_index is not None and order_market_index != market_index:
                     continue
+                
+                orders_by_market.setdefault(order_market_index, []).append(order_index)
+            
+            cancelled_count = 0
+            for order_market_index, order_indexes in orders_by_market.items():
+                cancelled_count += await self.cancel_orders(
+                    account_index, order_market_index, order_indexes
+                )
             
             if cancelled_count > 0:
                 logger.info("批量取消订单完成",
@@ -1241,6 +1269,7 @@ class OrderManager:
                     if age_seconds > timeout_seconds:
                         # 订单超时，自动标记为失败
                         order.status = OrderStatus.FAILED
+                        self._notify_order_done(order.id)
                         expired_orders.append(order)
                         logger.warning("🕒 订单已超时，自动标记为失败",
                                      order_id=order.id,
@@ -1551,6 +1580,9 @@ class OrderManager:
                         elif order_status.status == "failed":
                             order.status = OrderStatus.FAILED
                             logger.warning("订单执行失败", order_id=order_id, sdk_order_id=order.sdk_order_id)
+                        
+                        if order.status != OrderStatus.PENDING:
+                            self._notify_order_done(order_id)
                 
                 except Exception as e:
                     logger.debug("查询订单状态失败", 
@@ -1565,6 +1597,7 @@ class OrderManager:
                 if time_since_created.total_seconds() > 30:  # 30 seconds timeout
                     order.status = OrderStatus.FAILED
                     logger.warning("订单超时失败", order_id=order_id)
+                    self._notify_order_done(order_id)
     
     async def get_account_active_orders_from_api(self, account_index: int) -> List[dict]:
         """从Lighter API获取账户活跃订单"""
@@ -5,6 +5,7 @@ Based on official lighter-python examples
 
 import asyncio
 import json
+import logging
 from typing import Dict, List, Optional, Callable, Set
 from datetime import datetime
 from decimal import Decimal
@@ -681,22 +682,25 @@ class WebSocketManager:
     def get_latest_market_data(self, market_index: int) -> Optional[MarketData]:
         """Get latest market data for a market"""
         result = self.latest_market_data.get(market_index)
-        logger.debug("🔍 WebSocket管理器数据查询", 
-                   requested_market_index=market_index,
-                   requested_type=type(market_index).__name__,
-                   available_keys=list(self.latest_market_data.keys()),
-                   result_found=bool(result),
-                   is_connected=self.is_connected)
+        # 高频查询路径：仅在开启DEBUG时才构建可用市场列表
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 WebSocket管理器数据查询", 
+                       requested_market_index=market_index,
+                       requested_type=type(market_index).__name__,
+                       available_keys=list(self.latest_market_data.keys()),
+                       result_found=bool(result),
+                       is_connected=self.is_connected)
         
         # 如果没有数据且连接正常，检查是否需要重新订阅
         if not result and self.is_connected:
+            is_subscribed = market_index in self.subscribed_markets
             logger.warning("WebSocket已连接但无市场数据", 
                          market_index=market_index,
                          subscribed_markets=list(self.subscribed_markets),
-                         is_subscribed=market_index in self.subscribed_markets)
+                         is_subscribed=is_subscribed)
             
             # 如果该市场未订阅，添加订阅
-            if market_index not in self.subscribed_markets:
+            if not is_subscribed:
                 logger.info("添加缺失的市场订阅", market_index=market_index)
                 asyncio.create_task(self._add_market_subscription(market_index))
         
@@ -876,8 +880,8 @@ class WebSocketManager:
                         logger.error("健康检查：连接失效重新初始化失败", 
                                    error=str(reinit_error))
                 
-                # 检查每个订阅市场的数据新鲜度
-                for market_index in self.subscribed_markets:
+                # 检查每个订阅市场的数据新鲜度（遍历快照，期间新增订阅不影响本轮检查）
+                for market_index in tuple(self.subscribed_markets):
                     market_data = self.latest_market_data.get(market_index)
                     if market_data:
                         data_age = (current_time - market_data.timestamp).total_seconds()
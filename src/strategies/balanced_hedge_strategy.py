@@ -4,14 +4,19 @@ Balanced Hedge Strategy Implementation
 """
 
 import asyncio
-from typing import Dict, List, Optional, Tuple
+import logging
+import re
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 from datetime import datetime
 from decimal import Decimal
 import structlog
 
 from src.models import (
     HedgePosition, Position, TradingPairConfig, OrderInfo, 
-    PositionStatus, OrderStatus, LeverageConfig, MarketData, OrderBook
+    PositionStatus, OrderStatus, LeverageConfig, MarketData, OrderBook,
+    POSITION_MARKET_FIELDS, POSITION_SIZE_FALLBACK_FIELDS
 )
 from src.services.order_manager import OrderManager
 from src.services.account_manager import AccountManager
@@ -19,6 +24,145 @@ from src.utils.logger import trade_logger
 
 logger = structlog.get_logger()
 
+# 热路径上复用的Decimal常量，避免每次调用重复解析字符串字面量
+_TEN_THOUSAND = Decimal(10000)
+_MAX_MARGIN_LOSS_PERCENT = Decimal('0.5')   # 50%保证金亏损
+_NON_LEVERAGED_MAX_STOP_LOSS_PERCENT = Decimal('0.5')  # 无杠杆时最大止损50%
+_SAFETY_FACTOR = Decimal('0.8')             # 80%安全系数
+_PRICE_TOLERANCE = Decimal('0.02')          # 2%成交价格容差
+_UNIFIED_PRICE_BUFFER = Decimal('0.02')     # 2%统一下单价格缓冲
+_DEFAULT_EXIT_THRESHOLD = Decimal('0.02')   # 2%默认对冲退出阈值
+_MAX_SPREAD_FOR_ENTRY = Decimal('0.005')    # 0.5%开仓最大价差
+
+# 交易对名称/ID推断市场类型的规则：(名称匹配, ID匹配, 市场类型)，按顺序取第一个命中项
+_MARKET_TYPE_RULES = (
+    (re.compile(r'btc|bitcoin'), re.compile(r'btc'), "BTC"),
+    (re.compile(r'eth|ethereum'), re.compile(r'eth'), "ETH"),
+    (re.compile(r'sol|solana'), re.compile(r'sol'), "SOL"),
+)
+
+# 统一下单入口的订单类型及日志名称
+_ORDER_KIND_LABELS = {
+    "market_close": "平仓订单",
+    "limit_close": "精确平仓订单",
+    "market_hedge": "对冲订单",
+}
+
+# 订单元数据模板，下单时仅合并与本次订单相关的字段
+_CLOSE_ORDER_METADATA = {"is_close_order": True}
+_PRECISE_CLOSE_ORDER_METADATA = {"is_close_order": True, "is_precise_close": True}
+_PRECISE_HEDGE_ORDER_METADATA = {"is_hedge_order": True, "market_order": True, "precise_hedge": True}
+
+# 方向分配常量：(下单方向, 仓位角色)，按下标奇偶交替分配
+_LONG_ASSIGNMENT = ("buy", "long")
+_SHORT_ASSIGNMENT = ("sell", "short")
+_ALTERNATING_ASSIGNMENTS = (_LONG_ASSIGNMENT, _SHORT_ASSIGNMENT)
+
+# SDK认证令牌默认10分钟有效，缓存时提前刷新留出余量
+_AUTH_TOKEN_TTL_SECONDS = 600
+_AUTH_TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+# WebSocket推送的仓位在此时间内视为新鲜，可直接使用而不查询REST接口
+_POSITION_CACHE_TTL_SECONDS = 0.5
+
+
+class ParsedPosition(NamedTuple):
+    """从交易所仓位数据解析出的仓位，字段名与Position模型保持一致
+
+    只由position字段（基础资产数量）和为±1的sign构建，其余仓位不构建
+    """
+    market_index: int
+    size: float
+    side: str   # "long" / "short"
+    sign: int
+
+
+def _side_from_sign(sign, default: str = 'unknown') -> str:
+    """根据交易所仓位的sign字段确定方向"""
+    if sign == 1:
+        return 'long'
+    if sign == -1:
+        return 'short'
+    return default
+
+
+def _positions_log_detail(positions: List[dict]) -> List[dict]:
+    """构建止损止盈仓位的日志明细（仅在INFO日志启用时调用）"""
+    return [{
+        "account": p["account_index"],
+        "side": p["side"],
+        "amount": float(p["amount"]),
+        "entry_price": float(p["entry_price"])
+    } for p in positions]
+
+
+def _position_objects_log_detail(positions: List) -> List[dict]:
+    """构建交易所仓位对象的日志明细（仅在INFO日志启用时调用）"""
+    return [{
+        'side': getattr(p, 'side', 'unknown'),
+        'size': float(getattr(p, 'size', 0)),
+        'market': getattr(p, 'market_index', getattr(p, 'market', 'unknown')),
+        'entry_price': float(getattr(p, 'entry_price', 0))
+    } for p in positions]
+
+
+# 调试日志用：每种响应类的公开属性名只计算一次
+_PUBLIC_ATTRS_CACHE: Dict[type, Tuple[str, ...]] = {}
+
+
+def _public_attr_names(obj) -> Tuple[str, ...]:
+    """返回对象所属类的公开属性名（按类缓存，以首个实例的dir()为准）"""
+    cls = type(obj)
+    names = _PUBLIC_ATTRS_CACHE.get(cls)
+    if names is None:
+        names = tuple(attr for attr in dir(obj) if not attr.startswith('_'))
+        _PUBLIC_ATTRS_CACHE[cls] = names
+    return names
+
+
+def _to_float(value, default: Optional[float] = 0.0) -> Optional[float]:
+    """把交易所返回的数值（str/Decimal/int/float）转为float，无法转换时返回default"""
+    if value.__class__ is float:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# 每种仓位类实际具备的字段: (市场字段, 是否有position, 是否有sign, 备用大小字段)
+_POSITION_FIELDS_CACHE: Dict[type, Tuple[Tuple[str, ...], bool, bool, Tuple[str, ...]]] = {}
+
+
+def _position_fields(pos_data) -> Tuple[Tuple[str, ...], bool, bool, Tuple[str, ...]]:
+    """解析仓位对象具备哪些候选字段，SDK类型按类缓存，避免每个仓位重复hasattr探测"""
+    cls = type(pos_data)
+    fields = _POSITION_FIELDS_CACHE.get(cls)
+    if fields is None:
+        fields = (
+            tuple(name for name in POSITION_MARKET_FIELDS if hasattr(pos_data, name)),
+            hasattr(pos_data, 'position'),
+            hasattr(pos_data, 'sign'),
+            tuple(name for name in POSITION_SIZE_FALLBACK_FIELDS if hasattr(pos_data, name)),
+        )
+        # SimpleNamespace等动态对象的字段因实例而异，不能按类缓存
+        if cls is not SimpleNamespace:
+            _POSITION_FIELDS_CACHE[cls] = fields
+    return fields
+
+
+def _detect_orders_extractor(orders_response) -> Optional[Callable[[object], List]]:
+    """根据活跃订单响应的结构选择订单列表提取方式；SDK返回结构固定，只需判断一次"""
+    if hasattr(orders_response, 'orders'):
+        return lambda r: list(r.orders or [])
+    if isinstance(orders_response, list):
+        return lambda r: r
+    if isinstance(orders_response, dict) and 'orders' in orders_response:
+        return lambda r: r['orders'] or []
+    if hasattr(orders_response, '__iter__') and not isinstance(orders_response, str):
+        return list
+    return None
+
 
 class BalancedHedgeStrategy:
     """平衡对冲策略实现"""
@@ -32,6 +176,47 @@ class BalancedHedgeStrategy:
         self.config_manager = getattr(order_manager, 'config_manager', None)
         # 初始化活跃仓位字典
         self.active_positions = {}
+        # 活跃仓位增删或标记变化时递增，供Web接口判断仓位快照是否需要重建
+        self.positions_version = 0
+        # 并发提交订单（如止损止盈）时同时在途的RPC上限
+        self._rpc_concurrency = 8
+        if self.config_manager and getattr(self.config_manager, 'config', None):
+            self._rpc_concurrency = self.config_manager.get_trading_engine_config().get('rpc_concurrency', 8)
+        # 按账户缓存的认证令牌: account_index -> (token, 过期时间monotonic)
+        self._auth_token_cache: Dict[int, Tuple[str, float]] = {}
+        # 方向轮转历史及WebSocket推送的最新行情缓存
+        self._direction_cache: Dict[str, Dict] = {}
+        self._latest_market_data: Dict[int, MarketData] = {}
+        self._latest_orderbooks: Dict[int, OrderBook] = {}
+        # WebSocket推送的仓位: account_index -> market_index -> (仓位列表, 更新时间monotonic)
+        self._positions_cache: Dict[int, Dict[int, Tuple[List[ParsedPosition], float]]] = {}
+        # 活跃订单响应的列表提取函数，首次收到响应时确定
+        self._orders_extractor: Optional[Callable[[object], List]] = None
+    
+    async def _get_auth_token(self, account_index: int) -> Optional[str]:
+        """获取账户认证令牌，未过期时复用缓存避免重复签名"""
+        cached = self._auth_token_cache.get(account_index)
+        now = time.monotonic()
+        if cached and now < cached[1]:
+            return cached[0]
+        
+        if not self.client_factory:
+            return None
+        
+        signer_client = await self.client_factory.get_signer_client(account_index)
+        if not signer_client:
+            logger.debug("SignerClient不可用，使用无认证模式", account_index=account_index)
+            return None
+        
+        auth_result, auth_error = signer_client.create_auth_token_with_expiry()
+        if not auth_result or auth_error:
+            logger.debug("认证令牌创建失败", account_index=account_index, error=auth_error)
+            return None
+        
+        self._auth_token_cache[account_index] = (
+            auth_result, now + _AUTH_TOKEN_TTL_SECONDS - _AUTH_TOKEN_REFRESH_MARGIN_SECONDS
+        )
+        return auth_result
     
     def _infer_market_type_from_pair(self, pair_config: TradingPairConfig) -> str:
         """从交易对配置推断市场类型"""
@@ -40,18 +225,15 @@ class BalancedHedgeStrategy:
             name_lower = pair_config.name.lower()
             id_lower = pair_config.id.lower()
             
-            if 'btc' in name_lower or 'btc' in id_lower or 'bitcoin' in name_lower:
-                return "BTC"
-            elif 'eth' in name_lower or 'eth' in id_lower or 'ethereum' in name_lower:
-                return "ETH"
-            elif 'sol' in name_lower or 'sol' in id_lower or 'solana' in name_lower:
-                return "SOL"
-            else:
-                # 默认使用BTC配置
-                logger.debug("无法识别市场类型，使用默认BTC配置", 
-                           pair_name=pair_config.name, 
-                           pair_id=pair_config.id)
-                return "BTC"
+            for name_re, id_re, market_type in _MARKET_TYPE_RULES:
+                if name_re.search(name_lower) or id_re.search(id_lower):
+                    return market_type
+            
+            # 默认使用BTC配置
+            logger.debug("无法识别市场类型，使用默认BTC配置", 
+                       pair_name=pair_config.name, 
+                       pair_id=pair_config.id)
+            return "BTC"
                 
         except Exception as e:
             logger.error("推断市场类型失败，使用默认BTC配置", error=str(e))
@@ -89,21 +271,26 @@ class BalancedHedgeStrategy:
                        pair_id=pair_config.id,
                        accounts=accounts)
             
-            # 第一步：取消所有委托订单
-            logger.info("🧹 步骤1: 取消所有委托订单", 
+            # 第一步、第二步：每个账户独立执行“取消委托订单 → 平掉仓位”，
+            # 账户之间并发流水线执行；开仓仍需等待所有账户清理完成以保证同步下单
+            logger.info("🧹 步骤1-2: 取消委托订单并平掉仓位", 
                        pair_id=pair_config.id,
                        accounts=accounts)
             
-            cleanup_orders_success = await self._cleanup_all_pending_orders(pair_config, accounts)
-            if not cleanup_orders_success:
-                logger.warning("⚠️ 清理委托订单部分失败，继续后续流程")
+            semaphore = asyncio.Semaphore(self._rpc_concurrency)
             
-            # 第二步：平掉所有仓位
-            logger.info("🧹 步骤2: 平掉所有仓位", 
-                       pair_id=pair_config.id,
-                       accounts=accounts)
+            async def _prepare_account(account_index: int) -> Tuple[bool, bool]:
+                async with semaphore:
+                    orders_ok = await self._cleanup_all_pending_orders(pair_config, [account_index])
+                    positions_ok = await self._cleanup_all_positions(pair_config, [account_index])
+                    return orders_ok, positions_ok
             
-            cleanup_positions_success = await self._cleanup_all_positions(pair_config, accounts)
+            cleanup_results = await asyncio.gather(*(_prepare_account(a) for a in accounts))
+            cleanup_orders_success = all(orders_ok for orders_ok, _ in cleanup_results)
+            cleanup_positions_success = all(positions_ok for _, positions_ok in cleanup_results)
+            
+            if not cleanup_orders_success:
+                logger.warning("⚠️ 清理委托订单部分失败，继续后续流程")
             if not cleanup_positions_success:
                 logger.warning("⚠️ 清理仓位部分失败，继续后续流程")
             
@@ -411,7 +598,7 @@ class BalancedHedgeStrategy:
             price_consistency_verified = True  # 市价单直接设为True，确保止损止盈创建
             
             # 定义价格容差
-            strict_tolerance = Decimal('0.02')  # 2%容差
+            strict_tolerance = _PRICE_TOLERANCE  # 2%容差
             price_diff = Decimal('0')
             
             if len(entry_prices) >= 2:
@@ -497,6 +684,7 @@ class BalancedHedgeStrategy:
                 if not hasattr(self, 'active_positions'):
                     self.active_positions = {}
                 self.active_positions[position_id] = hedge_position
+                self.positions_version += 1
                 
                 # 创建协调的止损止盈订单
                 logger.info("开始创建协调的对冲止损止盈订单", position_id=position_id)
@@ -589,17 +777,15 @@ class BalancedHedgeStrategy:
                                          side=position.side,
                                          size=float(position.size))
                     
+                    # 仓位明细只在INFO启用时构建一次
+                    positions_detail = (_positions_log_detail(positions_for_sl_tp)
+                                        if logger.isEnabledFor(logging.INFO) else None)
                     logger.info("准备止损止盈仓位数据",
                                position_id=position_id,
                                positions_count=len(positions_to_use),
                                valid_positions_count=len(positions_for_sl_tp),
-                               positions_data=positions_for_sl_tp,
-                               positions_detail=[{
-                                   "account": p["account_index"],
-                                   "side": p["side"], 
-                                   "amount": float(p["amount"]),
-                                   "entry_price": float(p["entry_price"])
-                               } for p in positions_for_sl_tp])
+                               positions_data=positions_for_sl_tp if logger.isEnabledFor(logging.DEBUG) else None,
+                               positions_detail=positions_detail)
                     
                     # 检查是否有有效仓位
                     if not positions_for_sl_tp:
@@ -665,6 +851,7 @@ class BalancedHedgeStrategy:
             if hasattr(self, 'active_positions') and position_id in self.active_positions:
                 logger.info("清理失败的仓位状态", position_id=position_id)
                 del self.active_positions[position_id]
+                self.positions_version += 1
                 
             return None
     
@@ -900,9 +1087,16 @@ class BalancedHedgeStrategy:
                         # 如果已经是对象，直接使用
                         leverage_config = leverage_config_data
             
+            # 对冲仓位的各腿通常处于同一市场，每个市场只查询一次行情
+            market_data_by_index: Dict[int, Optional[MarketData]] = {}
+            
             for position in hedge_position.positions:
                 # 获取当前市场价格
-                market_data = await self.order_manager.get_market_data(position.market_index)
+                if position.market_index not in market_data_by_index:
+                    market_data_by_index[position.market_index] = await self.order_manager.get_market_data(
+                        position.market_index
+                    )
+                market_data = market_data_by_index[position.market_index]
                 if market_data:
                     position.current_price = market_data.price
                     
@@ -925,8 +1119,9 @@ class BalancedHedgeStrategy:
                             )
                             position.margin_ratio = margin_ratio
                             
-                            # 检查是否接近清算
-                            if self._is_near_liquidation(position, position.current_price, leverage_config):
+                            # 检查是否接近清算（复用已计算的保证金比率）
+                            if self._is_near_liquidation(position, position.current_price, leverage_config,
+                                                         margin_ratio=margin_ratio):
                                 logger.warning("仓位接近清算，建议立即平仓",
                                              position_id=position.id,
                                              hedge_position_id=hedge_position.id,
@@ -1019,7 +1214,7 @@ class BalancedHedgeStrategy:
                 # 杠杆交易的最大止损更保守
                 max_stop_loss_percent = Decimal('0.1') / leverage  # 杠杆越高，止损越严格
             else:
-                max_stop_loss_percent = Decimal('0.5')  # 50% for non-leveraged
+                max_stop_loss_percent = _NON_LEVERAGED_MAX_STOP_LOSS_PERCENT  # 50% for non-leveraged
             
             if price_change_percent > max_stop_loss_percent:
                 logger.info("触发杠杆调整止损保护",
@@ -1641,6 +1836,7 @@ class BalancedHedgeStrategy:
                     self.active_positions[hedge_position_id].metadata['manual_intervention_required'] = True
                     self.active_positions[hedge_position_id].metadata['verification_failed_at'] = datetime.now().isoformat()
                     self.active_positions[hedge_position_id].metadata['verification_results'] = verification_results
+                    self.positions_version += 1
                 
                 return False
             
@@ -1650,6 +1846,7 @@ class BalancedHedgeStrategy:
             # 从活跃仓位中移除
             if hedge_position_id in self.active_positions:
                 del self.active_positions[hedge_position_id]
+                self.positions_version += 1
                 logger.info("🧹 已从活跃仓位列表中移除", position_id=hedge_position_id)
             
             return True
@@ -1664,6 +1861,7 @@ class BalancedHedgeStrategy:
                 self.active_positions[hedge_position_id].metadata['system_error'] = True
                 self.active_positions[hedge_position_id].metadata['error_at'] = datetime.now().isoformat()
                 self.active_positions[hedge_position_id].metadata['error_message'] = str(e)
+                self.positions_version += 1
             
             return False
     
@@ -1673,6 +1871,8 @@ class BalancedHedgeStrategy:
         返回订单的实际状态
         支持重试机制解决API延迟问题
         """
+        # 匹配循环中反复比较的目标ID只转换一次字符串
+        order_id_str = str(order_id)
         for attempt in range(max_retries):
             try:
                 logger.info("🔍 开始同步订单状态", 
@@ -1695,18 +1895,7 @@ class BalancedHedgeStrategy:
                 # 获取认证令牌 - 通过对应账户的SignerClient创建
                 auth_token = None
                 try:
-                    signer_client = await self.client_factory.get_signer_client(account_index)
-                    if signer_client:
-                        auth_result, auth_error = signer_client.create_auth_token_with_expiry()
-                        if auth_result and not auth_error:
-                            auth_token = auth_result
-                            logger.debug("获取认证令牌成功", 
-                                       account_index=account_index,
-                                       token_preview=auth_result[:20] + "..." if auth_result else None)
-                        else:
-                            logger.debug("认证令牌创建失败", account_index=account_index, error=auth_error)
-                    else:
-                        logger.debug("SignerClient不可用，使用无认证模式", account_index=account_index)
+                    auth_token = await self._get_auth_token(account_index)
                 except Exception as e:
                     logger.debug("获取认证令牌失败，使用无认证模式", account_index=account_index, error=str(e))
                 
@@ -1768,7 +1957,7 @@ class BalancedHedgeStrategy:
                                        order_market=getattr(order, 'market_index', 'unknown'))
                             
                             for api_order_id in order_ids_to_check:
-                                if api_order_id and str(api_order_id) in str(order_id):
+                                if api_order_id and str(api_order_id) in order_id_str:
                                     order_details = order
                                     logger.info("✅ 找到匹配订单", 
                                                api_order_id=api_order_id, 
@@ -1811,7 +2000,7 @@ class BalancedHedgeStrategy:
                                            order_status=getattr(order, 'status', 'unknown'))
                                 
                                 for api_order_id in order_ids_to_check:
-                                    if api_order_id and str(api_order_id) in str(order_id):
+                                    if api_order_id and str(api_order_id) in order_id_str:
                                         order_details = order
                                         logger.info("✅ 找到历史订单", 
                                                    api_order_id=api_order_id, 
@@ -1907,6 +2096,7 @@ class BalancedHedgeStrategy:
         增强型订单检测，使用多种方法查找订单状态
         当常规API查询失败时使用此方法
         """
+        order_id_str = str(order_id)
         try:
             logger.info("🔍 启动增强型订单检测", 
                        order_id=order_id, 
@@ -1923,11 +2113,7 @@ class BalancedHedgeStrategy:
                 # 获取认证令牌
                 auth_token = None
                 try:
-                    signer_client = await self.client_factory.get_signer_client(account_index)
-                    if signer_client:
-                        auth_result, auth_error = signer_client.create_auth_token_with_expiry()
-                        if auth_result and not auth_error:
-                            auth_token = auth_result
+                    auth_token = await self._get_auth_token(account_index)
                 except Exception:
                     pass
                 
@@ -1959,9 +2145,10 @@ class BalancedHedgeStrategy:
                         for trade_id in trade_ids_to_check:
                             if trade_id:
                                 # 更宽松的匹配：部分匹配即可
-                                if (str(trade_id) in str(order_id) or 
-                                    str(order_id) in str(trade_id) or
-                                    str(trade_id).split('-')[-1] in str(order_id)):
+                                trade_id_str = str(trade_id)
+                                if (trade_id_str in order_id_str or 
+                                    order_id_str in trade_id_str or
+                                    trade_id_str.split('-')[-1] in order_id_str):
                                     
                                     status = getattr(trade, 'status', 'unknown')
                                     logger.info("✅ 在交易记录中找到匹配订单", 
@@ -2004,7 +2191,10 @@ class BalancedHedgeStrategy:
                         ]
                         
                         for oid in order_ids:
-                            if oid and (str(oid) in str(order_id) or str(order_id) in str(oid)):
+                            if not oid:
+                                continue
+                            oid_str = str(oid)
+                            if oid_str in order_id_str or order_id_str in oid_str:
                                 status = getattr(order, 'status', 'unknown')
                                 logger.info("✅ 在扩展查询中找到匹配订单",
                                            found_id=oid,
@@ -2043,45 +2233,89 @@ class BalancedHedgeStrategy:
                         error=str(e))
             return None
     
-    async def _create_close_order(
+    async def _create_order(
         self,
+        *,
+        kind: str,
         account_index: int,
         market_index: int,
         side: str,
         amount: Decimal,
-        position_id: str
+        price: Optional[Decimal] = None,
+        metadata: Optional[dict] = None
     ) -> Optional[OrderInfo]:
-        """创建平仓订单"""
+        """
+        统一的下单入口
+        
+        Args:
+            kind: 订单类型，"market_close" / "limit_close" / "market_hedge"
+            metadata: 创建成功后写入订单的元数据
+        """
+        label = _ORDER_KIND_LABELS[kind]
         try:
-            logger.info("创建平仓订单",
+            logger.info(f"创建{label}",
                        account_index=account_index,
                        side=side,
-                       amount=float(amount))
+                       amount=float(amount),
+                       price=float(price) if price is not None else None)
             
-            # 创建市价单进行平仓
-            order = await self.order_manager.create_market_order(
-                account_index=account_index,
-                market_index=market_index,
-                side=side,
-                amount=amount,
-                reduce_only=True
-            )
+            # 对冲市价单下单前验证SignerClient可用性
+            if kind == "market_hedge" and not self.order_manager.has_signer_clients():
+                logger.error("无法创建市价单：没有可用的SignerClient",
+                           platform="Windows",
+                           account_index=account_index,
+                           available_accounts=self.order_manager.get_available_accounts())
+                raise Exception("系统在Windows平台上运行，SignerClient不可用。请在WSL/Linux/macOS环境下运行")
             
-            if order:
-                order.metadata = {
-                    "hedge_position_id": position_id,
-                    "is_close_order": True
-                }
+            if kind == "limit_close":
+                # 使用限价单确保价格精确一致
+                order = await self.order_manager.create_limit_order(
+                    account_index=account_index,
+                    market_index=market_index,
+                    side=side,
+                    amount=amount,
+                    price=price
+                )
+            else:
+                # 市价单确保快速成交，平仓单仅减仓
+                order = await self.order_manager.create_market_order(
+                    account_index=account_index,
+                    market_index=market_index,
+                    side=side,
+                    amount=amount,
+                    reduce_only=kind == "market_close"
+                )
+            
+            if order and metadata:
+                order.metadata = metadata
             
             return order
             
         except Exception as e:
-            logger.error("创建平仓订单失败",
+            logger.error(f"创建{label}失败",
                         account_index=account_index,
                         side=side,
                         error=str(e))
             raise
     
+    async def _create_close_order(
+        self,
+        account_index: int,
+        market_index: int,
+        side: str,
+        amount: Decimal,
+        position_id: str
+    ) -> Optional[OrderInfo]:
+        """创建平仓订单"""
+        return await self._create_order(
+            kind="market_close",
+            account_index=account_index,
+            market_index=market_index,
+            side=side,
+            amount=amount,
+            metadata={**_CLOSE_ORDER_METADATA, "hedge_position_id": position_id}
+        )
+    
     async def _create_precise_close_order(
         self,
         account_index: int,
@@ -2093,40 +2327,20 @@ class BalancedHedgeStrategy:
         original_position_id: str
     ) -> Optional[OrderInfo]:
         """创建精确平仓订单 - 使用统一价格确保一致性"""
-        try:
-            logger.info("创建精确平仓订单",
-                       account_index=account_index,
-                       side=side,
-                       amount=float(amount),
-                       price=float(price),
-                       original_position_id=original_position_id)
-            
-            # 使用限价单确保价格精确一致
-            order = await self.order_manager.create_limit_order(
-                account_index=account_index,
-                market_index=market_index,
-                side=side,
-                amount=amount,
-                price=price
-            )
-            
-            if order:
-                order.metadata = {
-                    "hedge_position_id": position_id,
-                    "original_position_id": original_position_id,
-                    "is_close_order": True,
-                    "is_precise_close": True,
-                    "unified_close_price": float(price)
-                }
-            
-            return order
-            
-        except Exception as e:
-            logger.error("创建精确平仓订单失败",
-                        account_index=account_index,
-                        side=side,
-                        error=str(e))
-            raise
+        return await self._create_order(
+            kind="limit_close",
+            account_index=account_index,
+            market_index=market_index,
+            side=side,
+            amount=amount,
+            price=price,
+            metadata={
+                **_PRECISE_CLOSE_ORDER_METADATA,
+                "hedge_position_id": position_id,
+                "original_position_id": original_position_id,
+                "unified_close_price": float(price)
+            }
+        )
     
     async def _verify_position_price_consistency(self, hedge_position: HedgePosition) -> bool:
         """验证对冲仓位的价格一致性"""
@@ -2212,32 +2426,33 @@ class BalancedHedgeStrategy:
                 adjusted_loss_bps = max_loss_bps
             
             # 转换为小数
-            profit_threshold = Decimal(str(adjusted_profit_bps)) / Decimal('10000')
-            loss_threshold = Decimal(str(adjusted_loss_bps)) / Decimal('10000')
+            profit_threshold = Decimal(adjusted_profit_bps) / _TEN_THOUSAND
+            loss_threshold = Decimal(adjusted_loss_bps) / _TEN_THOUSAND
             
             # 设置整体对冲退出阈值 (使用较大的阈值)
             exit_threshold = max(profit_threshold, loss_threshold)
             
             # 为对冲仓位的每个子仓位设置相反的阈值
-            position_thresholds = {}
+            # 只有多/空两种方向，阈值模板预先构建一次，各子仓位共享
+            # 多仓：止盈在上方，止损在下方
+            long_thresholds = {
+                "take_profit": profit_threshold,    # 止盈
+                "stop_loss": -loss_threshold,       # 止损
+                "side": "long",
+                "leverage": leverage
+            }
+            # 空仓：止盈在下方，止损在上方 (相反)
+            short_thresholds = {
+                "take_profit": -profit_threshold,   # 止盈 (价格下跌)
+                "stop_loss": loss_threshold,        # 止损 (价格上涨)
+                "side": "short",
+                "leverage": leverage
+            }
             
-            for position in hedge_position.positions:
-                if position.side == "long":
-                    # 多仓：止盈在上方，止损在下方
-                    position_thresholds[position.id] = {
-                        "take_profit": profit_threshold,    # 止盈
-                        "stop_loss": -loss_threshold,       # 止损
-                        "side": "long",
-                        "leverage": leverage
-                    }
-                else:  # short
-                    # 空仓：止盈在下方，止损在上方 (相反)
-                    position_thresholds[position.id] = {
-                        "take_profit": -profit_threshold,   # 止盈 (价格下跌)
-                        "stop_loss": loss_threshold,        # 止损 (价格上涨)
-                        "side": "short",
-                        "leverage": leverage
-                    }
+            position_thresholds = {
+                position.id: long_thresholds if position.side == "long" else short_thresholds
+                for position in hedge_position.positions
+            }
             
             logger.debug("对冲退出阈值设置",
                         exit_threshold_percent=float(exit_threshold * 100),
@@ -2254,7 +2469,7 @@ class BalancedHedgeStrategy:
         except Exception as e:
             logger.error("获取对冲退出阈值失败", error=str(e))
             # 返回默认配置
-            default_threshold = Decimal('0.02')
+            default_threshold = _DEFAULT_EXIT_THRESHOLD
             return {
                 "exit_threshold": default_threshold,
                 "position_thresholds": {},
@@ -2345,11 +2560,13 @@ class BalancedHedgeStrategy:
         position: Position, 
         current_price: Decimal,
         leverage_config: LeverageConfig,
-        warning_threshold: Decimal = Decimal('1.2')  # 120% of maintenance margin
+        warning_threshold: Decimal = Decimal('1.2'),  # 120% of maintenance margin
+        margin_ratio: Optional[Decimal] = None
     ) -> bool:
-        """检查是否接近清算"""
+        """检查是否接近清算（可传入已计算的保证金比率以避免重复计算）"""
         try:
-            margin_ratio = self._calculate_margin_ratio(position, current_price, leverage_config)
+            if margin_ratio is None:
+                margin_ratio = self._calculate_margin_ratio(position, current_price, leverage_config)
             
             # 如果保证金比率低于警告阈值，则接近清算
             is_near = margin_ratio < warning_threshold and margin_ratio > Decimal('1')
@@ -2430,7 +2647,7 @@ class BalancedHedgeStrategy:
             spread_percent = (ask_price - bid_price) / market_data.price
             
             # 检查波动性是否适合开仓 (价差小于0.5%认为波动性不大)
-            max_spread_for_entry = Decimal('0.005')  # 0.5%
+            max_spread_for_entry = _MAX_SPREAD_FOR_ENTRY  # 0.5%
             
             if spread_percent > max_spread_for_entry:
                 logger.warning("当前波动性较大，不适合开仓",
@@ -2442,7 +2659,7 @@ class BalancedHedgeStrategy:
             # 使用更保守的价格策略，避免价格过于偏离市场
             # 对于买单使用较高的价格，对于卖单使用较低的价格，确保成交概率
             market_price = market_data.price
-            price_buffer = Decimal('0.02')  # 2%的价格缓冲
+            price_buffer = _UNIFIED_PRICE_BUFFER  # 2%的价格缓冲
             
             # 计算保守的统一价格，确保在合理范围内
             if abs(bid_price - market_price) / market_price > price_buffer or \
@@ -2513,48 +2730,19 @@ class BalancedHedgeStrategy:
         role: str
     ) -> Optional[OrderInfo]:
         """创建对冲订单 - 使用市价单确保快速成交"""
-        try:
-            logger.info(f"创建{role}对冲订单",
-                       account_index=account_index,
-                       side=side,
-                       amount=float(amount))
-            
-            # 验证SignerClient可用性
-            if not self.order_manager.has_signer_clients():
-                logger.error("无法创建市价单：没有可用的SignerClient",
-                           platform="Windows",
-                           account_index=account_index,
-                           available_accounts=self.order_manager.get_available_accounts())
-                raise Exception("系统在Windows平台上运行，SignerClient不可用。请在WSL/Linux/macOS环境下运行")
-            
-            # 使用市价单确保快速成交
-            order = await self.order_manager.create_market_order(
-                account_index=account_index,
-                market_index=market_index,
-                side=side,
-                amount=amount
-            )
-            
-            if order:
-                # 在订单元数据中记录对冲信息
-                order.metadata = {
-                    "hedge_position_id": position_id,
-                    "hedge_role": role,
-                    "is_hedge_order": True,
-                    "market_order": True,
-                    "precise_hedge": True
-                }
-                
-                # 注意：止损止盈订单现在在开仓完成后统一创建，确保价格协调
-            
-            return order
-            
-        except Exception as e:
-            logger.error("创建精确对冲订单失败",
-                        account_index=account_index,
-                        side=side,
-                        error=str(e))
-            raise
+        # 注意：止损止盈订单现在在开仓完成后统一创建，确保价格协调
+        return await self._create_order(
+            kind="market_hedge",
+            account_index=account_index,
+            market_index=market_index,
+            side=side,
+            amount=amount,
+            metadata={
+                **_PRECISE_HEDGE_ORDER_METADATA,
+                "hedge_position_id": position_id,
+                "hedge_role": role
+            }
+        )
     
     async def _create_hedge_stop_loss_take_profit_orders(
         self,
@@ -2586,11 +2774,11 @@ class BalancedHedgeStrategy:
             # 计算安全的最大止损距离（基于爆仓点）
             if leverage > 1:
                 # 计算最大允许的止损距离（基于50%爆仓点）
-                max_loss_percent = Decimal('0.5')  # 50%保证金亏损
-                max_stop_distance_percent = max_loss_percent / Decimal(str(leverage))
+                max_loss_percent = _MAX_MARGIN_LOSS_PERCENT  # 50%保证金亏损
+                max_stop_distance_percent = max_loss_percent / Decimal(leverage)
                 
                 # 为了安全，使用80%的最大距离作为安全上限
-                safety_factor = Decimal('0.8')
+                safety_factor = _SAFETY_FACTOR
                 safe_max_distance_percent = max_stop_distance_percent * safety_factor
             else:
                 # 现货交易的安全上限
@@ -2633,8 +2821,8 @@ class BalancedHedgeStrategy:
                                  using_percent=float(stop_loss_take_profit_percent * 100))
             
             # 转换为bps用于后续计算
-            adjusted_stop_loss_bps = int(stop_loss_take_profit_percent * 10000)
-            adjusted_take_profit_bps = int(stop_loss_take_profit_percent * 10000)  # 镜像对称，相同距离
+            adjusted_stop_loss_bps = int(stop_loss_take_profit_percent * _TEN_THOUSAND)
+            adjusted_take_profit_bps = int(stop_loss_take_profit_percent * _TEN_THOUSAND)  # 镜像对称，相同距离
             
             # 计算统一的对冲价格基准
             if not positions:
@@ -2655,21 +2843,27 @@ class BalancedHedgeStrategy:
             # Short止损价格 = Long止盈价格 (上方价格)
             # 由于止损和止盈使用相同距离，确保完美镜像对称
             
-            price_distance_percent = Decimal(adjusted_stop_loss_bps) / 10000  # 统一的价格距离
+            price_distance_percent = Decimal(adjusted_stop_loss_bps) / _TEN_THOUSAND  # 统一的价格距离
             hedge_lower_price = avg_entry_price * (1 - price_distance_percent)  # 下方触发价格
             hedge_upper_price = avg_entry_price * (1 + price_distance_percent)  # 上方触发价格
             
+            # 日志和元数据使用的浮点值只转换一次，Decimal仅用于下单触发价格
+            hedge_lower_price_f = float(hedge_lower_price)
+            hedge_upper_price_f = float(hedge_upper_price)
+            price_distance_percent_f = float(price_distance_percent * 100)
+            
+            positions_data = _positions_log_detail(positions) if logger.isEnabledFor(logging.INFO) else None
             logger.info("创建协调的对冲止损止盈订单",
                        hedge_position_id=hedge_position_id,
                        avg_entry_price=float(avg_entry_price),
-                       hedge_lower_price=float(hedge_lower_price),  # 下方触发价格
-                       hedge_upper_price=float(hedge_upper_price),  # 上方触发价格
-                       price_distance_percent=float(price_distance_percent * 100),
+                       hedge_lower_price=hedge_lower_price_f,  # 下方触发价格
+                       hedge_upper_price=hedge_upper_price_f,  # 上方触发价格
+                       price_distance_percent=price_distance_percent_f,
                        calculation_method=calculation_method,
                        config_value=stop_take_distance,
                        positions_count=len(positions),
                        leverage=leverage,
-                       positions_data=[{"account": p["account_index"], "side": p["side"], "amount": float(p["amount"]), "entry_price": float(p["entry_price"])} for p in positions])
+                       positions_data=positions_data)
             
             # 在创建订单前验证镜像对称性
             if not self._validate_stop_loss_take_profit_mirror(positions, hedge_lower_price, hedge_upper_price):
@@ -2677,129 +2871,130 @@ class BalancedHedgeStrategy:
                 return
             
             # 为每个仓位创建相应的止损止盈订单
-            for pos in positions:
-                account_index = pos["account_index"]
-                side = pos["side"]
-                amount = pos["amount"]
-                entry_price = pos["entry_price"]
-                
-                if side.lower() == "buy":
-                    # Long仓位：
-                    # - 止损：在下方价格卖出 (hedge_lower_price)
-                    # - 止盈：在上方价格卖出 (hedge_upper_price)
-                    sl_trigger_price = hedge_lower_price
-                    tp_trigger_price = hedge_upper_price
-                    sl_side = "sell"
-                    tp_side = "sell"
-                else:
-                    # Short仓位：
-                    # - 止损：在上方价格买入 (hedge_upper_price) -> 镜像对称
-                    # - 止盈：在下方价格买入 (hedge_lower_price) -> 镜像对称
-                    sl_trigger_price = hedge_upper_price  # Short的止损=Long的止盈价格
-                    tp_trigger_price = hedge_lower_price  # Short的止盈=Long的止损价格
-                    sl_side = "buy"
-                    tp_side = "buy"
-                
-                logger.info("仓位止损止盈设置",
-                           account_index=account_index,
-                           side=side,
-                           entry_price=float(entry_price),
-                           sl_trigger_price=float(sl_trigger_price),
-                           tp_trigger_price=float(tp_trigger_price))
-                
-                # 创建止损订单 - 使用限价单提高精准度
+            # 不同账户的订单并发提交，用信号量限制同时在途的RPC数量；
+            # 同一账户的签名交易共用nonce序列，按账户加锁逐笔提交
+            semaphore = asyncio.Semaphore(self._rpc_concurrency)
+            account_locks: Dict[int, asyncio.Lock] = {}
+            
+            # 循环前预先绑定热点方法，避免每条腿重复属性查找
+            create_sl = self.order_manager.create_stop_loss_order
+            create_tp = self.order_manager.create_take_profit_order
+            log_info = logger.info
+            log_error = logger.error
+            
+            async def _submit(account_index: int, side: str, amount: Decimal,
+                              trigger_price: Decimal, info: dict) -> Tuple[Optional[OrderInfo], dict]:
+                """提交单个止损/止盈订单，返回订单及其上下文信息"""
+                kind = info["kind"]
+                label = "止损订单" if kind == "stop_loss" else "止盈订单"
+                create = create_sl if kind == "stop_loss" else create_tp
                 try:
-                    logger.info("🛑 创建止损订单",
-                               account_index=account_index,
-                               market_index=market_index,
-                               side=sl_side,
-                               amount=float(amount),
-                               trigger_price=float(sl_trigger_price),
-                               order_type="limit")
-                    
-                    sl_order = await self.order_manager.create_stop_loss_order(
-                        account_index=account_index,
-                        market_index=market_index,
-                        side=sl_side,
-                        amount=amount,
-                        trigger_price=sl_trigger_price,
-                        order_type="limit"  # 使用限价单
-                    )
-                    
-                    # 添加OCO关联标记到订单元数据
-                    if sl_order:
-                        sl_order.metadata.update({
-                            "oco_group": hedge_position_id,  # OCO组标识
-                            "oco_type": "stop_loss",
-                            "paired_with": "take_profit"
-                        })
-                    
-                    if sl_order:
-                        sl_order.metadata.update({
-                            "hedge_position_id": hedge_position_id,
-                            "is_stop_loss": True,
-                            "entry_price": float(entry_price),
-                            "hedge_mirror_price": float(tp_trigger_price),  # 记录镜像价格
-                            "leverage": leverage,
-                            "calculated_distance_percent": float(price_distance_percent * 100),
-                            "dynamic_calculation": True  # 标记为动态计算
-                        })
-                        logger.info("止损订单创建成功", 
+                    async with account_locks[account_index], semaphore:
+                        log_info("🛑 创建止损订单" if kind == "stop_loss" else "💰 创建止盈订单",
                                    account_index=account_index,
-                                   order_id=sl_order.id,
-                                   trigger_price=float(sl_trigger_price))
-                    
+                                   market_index=market_index,
+                                   side=side,
+                                   amount=info["amount_f"],
+                                   trigger_price=info["trigger_price_f"],
+                                   order_type="limit")
+                        # 使用限价单提高精准度
+                        order = await create(
+                            account_index=account_index,
+                            market_index=market_index,
+                            side=side,
+                            amount=amount,
+                            trigger_price=trigger_price,
+                            order_type="limit"
+                        )
+                        return order, info
                 except Exception as e:
-                    logger.error("创建止损订单失败", 
+                    log_error(f"创建{label}失败", 
                                account_index=account_index, 
                                error=str(e))
-                
-                # 创建止盈订单 - 使用限价单获得更好价格
-                try:
-                    logger.info("💰 创建止盈订单",
-                               account_index=account_index,
-                               market_index=market_index,
-                               side=tp_side,
-                               amount=float(amount),
-                               trigger_price=float(tp_trigger_price),
-                               order_type="limit")
+                    return None, info
+            
+            submissions = []
+            try:
+                for pos in positions:
+                    account_index = pos["account_index"]
+                    side = pos["side"]
+                    amount = pos["amount"]
+                    amount_f = float(amount)
+                    entry_price_f = float(pos["entry_price"])
+                    if account_index not in account_locks:
+                        account_locks[account_index] = asyncio.Lock()
                     
-                    tp_order = await self.order_manager.create_take_profit_order(
-                        account_index=account_index,
-                        market_index=market_index,
-                        side=tp_side,
-                        amount=amount,
-                        trigger_price=tp_trigger_price,
-                        order_type="limit"
-                    )
+                    if side.lower() == "buy":
+                        # Long仓位：
+                        # - 止损：在下方价格卖出 (hedge_lower_price)
+                        # - 止盈：在上方价格卖出 (hedge_upper_price)
+                        sl_trigger_price = hedge_lower_price
+                        tp_trigger_price = hedge_upper_price
+                        sl_trigger_price_f = hedge_lower_price_f
+                        tp_trigger_price_f = hedge_upper_price_f
+                        sl_side = "sell"
+                        tp_side = "sell"
+                    else:
+                        # Short仓位：
+                        # - 止损：在上方价格买入 (hedge_upper_price) -> 镜像对称
+                        # - 止盈：在下方价格买入 (hedge_lower_price) -> 镜像对称
+                        sl_trigger_price = hedge_upper_price  # Short的止损=Long的止盈价格
+                        tp_trigger_price = hedge_lower_price  # Short的止盈=Long的止损价格
+                        sl_trigger_price_f = hedge_upper_price_f
+                        tp_trigger_price_f = hedge_lower_price_f
+                        sl_side = "buy"
+                        tp_side = "buy"
                     
-                    # 添加OCO关联标记到订单元数据
-                    if tp_order:
-                        tp_order.metadata.update({
-                            "oco_group": hedge_position_id,  # OCO组标识
-                            "oco_type": "take_profit", 
-                            "paired_with": "stop_loss"
-                        })
+                    log_info("仓位止损止盈设置",
+                               account_index=account_index,
+                               side=side,
+                               entry_price=entry_price_f,
+                               sl_trigger_price=sl_trigger_price_f,
+                               tp_trigger_price=tp_trigger_price_f)
                     
-                    if tp_order:
-                        tp_order.metadata.update({
-                            "hedge_position_id": hedge_position_id,
-                            "is_take_profit": True,
-                            "entry_price": float(entry_price),
-                            "hedge_mirror_price": float(sl_trigger_price),  # 记录镜像价格
-                            "leverage": leverage,
-                            "calculated_distance_percent": float(price_distance_percent * 100),
-                            "dynamic_calculation": True  # 标记为动态计算
-                        })
-                        logger.info("止盈订单创建成功", 
-                                   account_index=account_index,
-                                   order_id=tp_order.id,
-                                   trigger_price=float(tp_trigger_price))
+                    submissions.append(asyncio.create_task(_submit(
+                        account_index, sl_side, amount, sl_trigger_price,
+                        {"kind": "stop_loss", "account_index": account_index, "amount_f": amount_f,
+                         "entry_price_f": entry_price_f,
+                         "trigger_price_f": sl_trigger_price_f, "mirror_price_f": tp_trigger_price_f}
+                    )))
+                    submissions.append(asyncio.create_task(_submit(
+                        account_index, tp_side, amount, tp_trigger_price,
+                        {"kind": "take_profit", "account_index": account_index, "amount_f": amount_f,
+                         "entry_price_f": entry_price_f,
+                         "trigger_price_f": tp_trigger_price_f, "mirror_price_f": sl_trigger_price_f}
+                    )))
+                
+                # 按完成顺序写入元数据，与仍在途的下单请求重叠
+                for next_done in asyncio.as_completed(submissions):
+                    order, info = await next_done
+                    if order is None:
+                        continue
                     
-                except Exception as e:
-                    logger.error("创建止盈订单失败", 
-                               account_index=account_index, 
-                               error=str(e))
+                    is_stop_loss = info["kind"] == "stop_loss"
+                    # 一次性写入OCO关联标记和对冲信息到订单元数据
+                    order.metadata = {
+                        **order.metadata,
+                        "oco_group": hedge_position_id,  # OCO组标识
+                        "oco_type": info["kind"],
+                        "paired_with": "take_profit" if is_stop_loss else "stop_loss",
+                        "hedge_position_id": hedge_position_id,
+                        "is_stop_loss" if is_stop_loss else "is_take_profit": True,
+                        "entry_price": info["entry_price_f"],
+                        "hedge_mirror_price": info["mirror_price_f"],  # 记录镜像价格
+                        "leverage": leverage,
+                        "calculated_distance_percent": price_distance_percent_f,
+                        "dynamic_calculation": True  # 标记为动态计算
+                    }
+                    log_info("止损订单创建成功" if is_stop_loss else "止盈订单创建成功", 
+                               account_index=info["account_index"],
+                               order_id=order.id,
+                               trigger_price=info["trigger_price_f"])
+            finally:
+                # 提交或写入元数据时异常退出，取消仍在途的下单任务
+                for task in submissions:
+                    if not task.done():
+                        task.cancel()
         
         except Exception as e:
             logger.error("创建对冲止损止盈订单失败",
@@ -2808,30 +3003,60 @@ class BalancedHedgeStrategy:
     
     async def _execute_synchronized_orders(self, order_tasks: List) -> List:
         """同步执行订单以确保时间一致性"""
+        # 单调时钟计时，不受系统时间调整影响
+        start_ns = time.perf_counter_ns()
         try:
             logger.info("开始同步执行对冲订单", orders_count=len(order_tasks))
             
-            # 记录开始时间
-            start_time = datetime.now()
+            # 并发执行所有订单，15秒超时给网络请求足够时间；
+            # 用事件循环定时器直接取消gather，避免wait_for额外包装任务
+            loop = asyncio.get_running_loop()
+            tasks = [asyncio.ensure_future(t) for t in order_tasks]
+            gather_future = asyncio.gather(*tasks, return_exceptions=True)
+            timed_out = False
             
-            # 并发执行所有订单，使用更合理的超时时间
-            results = await asyncio.wait_for(
-                asyncio.gather(*order_tasks, return_exceptions=True),
-                timeout=15.0  # 15秒超时，给网络请求足够时间
-            )
+            def _cancel_on_timeout() -> None:
+                nonlocal timed_out
+                timed_out = True
+                gather_future.cancel()
             
-            # 记录执行时间
-            execution_time = (datetime.now() - start_time).total_seconds()
+            timeout_handle = loop.call_later(15.0, _cancel_on_timeout)
+            try:
+                results = await gather_future
+            except asyncio.CancelledError:
+                if not timed_out:
+                    raise
+                logger.error("同步订单执行超时",
+                            timeout_seconds=15.0,
+                            orders_count=len(order_tasks),
+                            execution_time_s=(time.perf_counter_ns() - start_ns) / 1e9)
+                # 超时前已完成的订单保留真实结果，避免已成交的一侧被当作失败而漏掉处理
+                return [
+                    t.exception() or t.result()
+                    if t.done() and not t.cancelled()
+                    else Exception("订单执行超时")
+                    for t in tasks
+                ]
+            finally:
+                timeout_handle.cancel()
             
             logger.info("同步订单执行完成",
-                       execution_time_ms=execution_time * 1000,
+                       execution_time_ms=(time.perf_counter_ns() - start_ns) / 1e6,
                        orders_count=len(order_tasks))
             
-            # 验证所有订单的时间戳接近
-            valid_orders = [r for r in results if isinstance(r, OrderInfo)]
-            if len(valid_orders) >= 2:
-                timestamps = [order.created_at for order in valid_orders]
-                time_diff = max(timestamps) - min(timestamps)
+            # 验证所有订单的时间戳接近（单次遍历筛选成功订单并求最早/最晚）
+            earliest = latest = None
+            valid_count = 0
+            for r in results:
+                if isinstance(r, OrderInfo):
+                    created_at = r.created_at
+                    if earliest is None or created_at < earliest:
+                        earliest = created_at
+                    if latest is None or created_at > latest:
+                        latest = created_at
+                    valid_count += 1
+            if valid_count >= 2:
+                time_diff = latest - earliest
                 
                 if time_diff.total_seconds() > 1.0:  # 超过1秒认为不同步
                     logger.warning("订单执行时间差异较大",
@@ -2842,31 +3067,25 @@ class BalancedHedgeStrategy:
             
             return results
             
-        except asyncio.TimeoutError:
-            logger.error("同步订单执行超时",
-                        timeout_seconds=15.0,
-                        orders_count=len(order_tasks),
-                        execution_time_s=(datetime.now() - start_time).total_seconds())
-            return [Exception("订单执行超时")] * len(order_tasks)
         except Exception as e:
             logger.error("同步订单执行失败",
                         error=str(e),
                         orders_count=len(order_tasks),
-                        execution_time_s=(datetime.now() - start_time).total_seconds())
+                        execution_time_s=(time.perf_counter_ns() - start_ns) / 1e9)
             return [e] * len(order_tasks)
     
     async def _get_account_balances(self, accounts: List[int]) -> Dict[int, Decimal]:
         """获取账户余额"""
         try:
-            balances = {}
-            for account_index in accounts:
-                # 从账户管理器获取余额（同步方法）
-                balance = self.account_manager.get_account_balance(account_index)
-                balances[account_index] = balance if balance else Decimal('0')
+            # 账户管理器的余额来自内存中的账户快照，直接同步读取即可
+            get_balance = self.account_manager.get_account_balance
+            balances = {account_index: get_balance(account_index) or Decimal('0')
+                        for account_index in accounts}
             
-            logger.debug("账户余额查询",
-                        accounts=accounts,
-                        balances={k: float(v) for k, v in balances.items()})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("账户余额查询",
+                            accounts=accounts,
+                            balances=balances)
             
             return balances
             
@@ -2884,47 +3103,28 @@ class BalancedHedgeStrategy:
         try:
             # 从缓存或配置获取上次的方向分配
             cache_key = f"direction_history_{pair_id}"
-            last_assignments = getattr(self, '_direction_cache', {}).get(cache_key, {})
+            last_assignments = self._direction_cache.get(cache_key, {})
             
             # 确保有多空平衡
             if len(accounts) < 2:
                 raise ValueError("对冲需要至少2个账户")
             
-            # 创建新的方向分配
-            new_assignments = {}
+            # 简单轮转逻辑：上次是空仓的账户这次做多，其余（含首次）做空
+            new_assignments = {
+                account_index: _LONG_ASSIGNMENT
+                if last_assignments.get(account_index, _LONG_ASSIGNMENT)[0] == "sell"
+                else _SHORT_ASSIGNMENT
+                for account_index in accounts
+            }
             
-            # 简单轮转逻辑：如果账户上次是多仓，这次就是空仓
-            for i, account_index in enumerate(accounts):
-                last_side = last_assignments.get(account_index, ("buy", "long"))[0]
-                
-                # 轮转方向
-                if last_side == "buy":
-                    new_side = "sell"
-                    new_role = "short"
-                else:
-                    new_side = "buy"
-                    new_role = "long"
-                
-                new_assignments[account_index] = (new_side, new_role)
-            
-            # 确保多空平衡 (至少有一个多仓和一个空仓)
-            sides = [assignment[0] for assignment in new_assignments.values()]
-            if "buy" not in sides or "sell" not in sides:
-                # 强制平衡：第一个账户买入，第二个账户卖出
-                accounts_list = list(accounts)
-                new_assignments[accounts_list[0]] = ("buy", "long")
-                new_assignments[accounts_list[1]] = ("sell", "short")
-                
-                # 其余账户轮转
-                for i, account in enumerate(accounts_list[2:], start=2):
-                    if i % 2 == 0:
-                        new_assignments[account] = ("buy", "long")
-                    else:
-                        new_assignments[account] = ("sell", "short")
+            # 确保多空平衡 (至少有一个多仓和一个空仓)，否则按奇偶交替分配
+            if len(set(new_assignments.values())) < 2:
+                new_assignments = {
+                    account_index: _ALTERNATING_ASSIGNMENTS[i & 1]
+                    for i, account_index in enumerate(accounts)
+                }
             
             # 缓存当前分配用于下次轮转
-            if not hasattr(self, '_direction_cache'):
-                self._direction_cache = {}
             self._direction_cache[cache_key] = new_assignments
             
             logger.info("方向轮转分配",
@@ -2937,27 +3137,22 @@ class BalancedHedgeStrategy:
         except Exception as e:
             logger.error("方向分配失败", pair_id=pair_id, accounts=accounts, error=str(e))
             # 返回默认分配
-            default_assignments = {}
-            for i, account in enumerate(accounts):
-                if i % 2 == 0:
-                    default_assignments[account] = ("buy", "long")
-                else:
-                    default_assignments[account] = ("sell", "short")
-            return default_assignments
+            return {
+                account: _ALTERNATING_ASSIGNMENTS[i & 1]
+                for i, account in enumerate(accounts)
+            }
     
     def update_market_data(self, market_data: MarketData) -> None:
         """Update strategy with latest market data from WebSocket"""
         try:
             # Cache latest market data for this market
-            if not hasattr(self, '_latest_market_data'):
-                self._latest_market_data = {}
-            
             self._latest_market_data[market_data.market_index] = market_data
             
-            logger.debug("策略市场数据更新",
-                        market_index=market_data.market_index,
-                        price=float(market_data.price),
-                        timestamp=market_data.timestamp.isoformat())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("策略市场数据更新",
+                            market_index=market_data.market_index,
+                            price=market_data.price,
+                            timestamp=market_data.timestamp)
                         
         except Exception as e:
             logger.error("更新市场数据失败",
@@ -2968,40 +3163,78 @@ class BalancedHedgeStrategy:
         """Update strategy with latest orderbook from WebSocket"""
         try:
             # Cache latest orderbook for this market
-            if not hasattr(self, '_latest_orderbooks'):
-                self._latest_orderbooks = {}
-            
             self._latest_orderbooks[orderbook.market_index] = orderbook
             
-            # Calculate spread for volatility assessment
-            if orderbook.bids and orderbook.asks:
+            # 价差仅用于调试日志，未开启DEBUG时跳过计算和格式化
+            if orderbook.bids and orderbook.asks and logger.isEnabledFor(logging.DEBUG):
                 best_bid = orderbook.bids[0]['price']
                 best_ask = orderbook.asks[0]['price']
-                spread_percent = (best_ask - best_bid) / best_bid * 100
+                spread_bps = (best_ask - best_bid) * _TEN_THOUSAND / best_bid if best_bid else None
                 
                 logger.debug("策略订单簿更新",
                             market_index=orderbook.market_index,
-                            best_bid=float(best_bid),
-                            best_ask=float(best_ask),
-                            spread_percent=float(spread_percent),
-                            timestamp=orderbook.timestamp.isoformat())
+                            best_bid=best_bid,
+                            best_ask=best_ask,
+                            spread_bps=spread_bps,
+                            timestamp=orderbook.timestamp)
             
         except Exception as e:
             logger.error("更新订单簿失败",
                         market_index=orderbook.market_index,
                         error=str(e))
     
+    def update_positions(self, account_index: int, positions) -> None:
+        """Update strategy with latest account positions from WebSocket"""
+        try:
+            if isinstance(positions, dict):
+                positions = positions.values()
+            
+            now = time.monotonic()
+            by_market: Dict[int, List] = {}
+            for pos_data in positions:
+                # WebSocket推送为字典，统一转换为与REST查询相同的ParsedPosition
+                if isinstance(pos_data, dict):
+                    pos_data = SimpleNamespace(**pos_data)
+                position_market = getattr(pos_data, 'market_id', getattr(pos_data, 'market_index', None))
+                if position_market is None:
+                    continue
+                
+                position_market = int(position_market)
+                market_positions = by_market.setdefault(position_market, [])
+                position_size = _to_float(getattr(pos_data, 'position', 0))
+                position_sign = getattr(pos_data, 'sign', None)
+                # 与REST查询一致：只缓存方向明确(sign为±1)的仓位
+                if position_size and position_sign in (1, -1):
+                    market_positions.append(ParsedPosition(
+                        position_market,
+                        position_size,
+                        _side_from_sign(position_sign),
+                        position_sign
+                    ))
+            
+            account_cache = self._positions_cache.setdefault(account_index, {})
+            for position_market, market_positions in by_market.items():
+                account_cache[position_market] = (market_positions, now)
+                
+        except Exception as e:
+            logger.error("更新仓位缓存失败",
+                        account_index=account_index,
+                        error=str(e))
+    
+    def _get_fresh_cached_positions(self, account_index: int, market_index: int) -> Optional[List]:
+        """返回足够新鲜的WebSocket仓位缓存，过期或缺失时返回None"""
+        cached = self._positions_cache.get(account_index, {}).get(market_index)
+        if cached and time.monotonic() - cached[1] < _POSITION_CACHE_TTL_SECONDS:
+            return cached[0]
+        return None
+    
     def get_cached_market_data(self, market_index: int) -> Optional[MarketData]:
         """Get cached market data for faster access"""
-        if hasattr(self, '_latest_market_data'):
-            return self._latest_market_data.get(market_index)
-        return None
+        return self._latest_market_data.get(market_index)
     
     def get_cached_orderbook(self, market_index: int) -> Optional[OrderBook]:
         """Get cached orderbook for faster access"""
-        if hasattr(self, '_latest_orderbooks'):
-            return self._latest_orderbooks.get(market_index)
-        return None
+        return self._latest_orderbooks.get(market_index)
     
     async def _cleanup_all_pending_orders(self, pair_config: TradingPairConfig, accounts: List[int]) -> bool:
         """
@@ -3021,38 +3254,41 @@ class BalancedHedgeStrategy:
                        market_index=pair_config.market_index,
                        accounts_count=len(accounts))
             
-            all_success = True
-            total_cancelled = 0
+            # 各账户并发清理，信号量代替逐账户的固定延迟来避免API限制
+            semaphore = asyncio.Semaphore(self._rpc_concurrency)
             
-            for account_index in accounts:
+            async def _cancel_one(account_index: int) -> Optional[int]:
+                """清理单个账户的历史订单，失败返回None"""
                 try:
-                    logger.info("📋 批量取消账户历史订单",
-                               account_index=account_index,
-                               market_index=pair_config.market_index)
-                    
-                    # 使用OrderManager的批量取消功能
-                    cancelled_count = await self.order_manager.cancel_all_inactive_orders(
-                        account_index=account_index,
-                        market_index=pair_config.market_index
-                    )
+                    async with semaphore:
+                        logger.info("📋 批量取消账户历史订单",
+                                   account_index=account_index,
+                                   market_index=pair_config.market_index)
+                        
+                        # 使用OrderManager的批量取消功能
+                        cancelled_count = await self.order_manager.cancel_all_inactive_orders(
+                            account_index=account_index,
+                            market_index=pair_config.market_index
+                        )
                     
                     if cancelled_count > 0:
-                        total_cancelled += cancelled_count
                         logger.info("✅ 账户历史订单清理完成",
                                    account_index=account_index,
                                    cancelled_count=cancelled_count)
                     else:
                         logger.info("✨ 账户无历史订单需要清理", 
                                    account_index=account_index)
+                    return cancelled_count
                     
                 except Exception as e:
                     logger.error("清理账户历史订单失败",
                                account_index=account_index,
                                error=str(e))
-                    all_success = False
-                    
-                # 短暂延迟避免API限制
-                await asyncio.sleep(0.2)
+                    return None
+            
+            results = await asyncio.gather(*[_cancel_one(a) for a in accounts])
+            all_success = all(r is not None for r in results)
+            total_cancelled = sum(r for r in results if r)
             
             if total_cancelled > 0:
                 logger.info("🧹 历史订单批量清理汇总",
@@ -3084,11 +3320,7 @@ class BalancedHedgeStrategy:
             # 获取认证令牌
             auth_token = None
             try:
-                signer_client = await self.client_factory.get_signer_client(account_index)
-                if signer_client:
-                    auth_result, auth_error = signer_client.create_auth_token_with_expiry()
-                    if auth_result and not auth_error:
-                        auth_token = auth_result
+                auth_token = await self._get_auth_token(account_index)
             except Exception as e:
                 logger.debug("获取认证令牌失败，使用无认证模式", 
                            account_index=account_index, error=str(e))
@@ -3107,35 +3339,30 @@ class BalancedHedgeStrategy:
                 )
             
             # 处理API响应，提取订单列表
-            if orders_response:
-                # 检查是否有orders属性
-                if hasattr(orders_response, 'orders'):
-                    orders_list = orders_response.orders
-                    return list(orders_list) if orders_list else []
-                # 如果返回的直接是列表
-                elif isinstance(orders_response, list):
-                    return orders_response
-                # 如果是字典格式
-                elif isinstance(orders_response, dict) and 'orders' in orders_response:
-                    return orders_response['orders'] or []
-                # 如果是其他可迭代对象，尝试转换为列表
-                elif hasattr(orders_response, '__iter__') and not isinstance(orders_response, str):
-                    try:
-                        return list(orders_response)
-                    except Exception as e:
-                        logger.debug("转换orders为列表失败", 
+            if not orders_response:
+                return []
+            
+            extractor = self._orders_extractor
+            if extractor is None:
+                extractor = _detect_orders_extractor(orders_response)
+                if extractor is None:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("未知的orders响应格式", 
                                    response_type=type(orders_response).__name__,
                                    account_index=account_index,
-                                   error=str(e))
-                        return []
-                # 如果是其他类型
-                else:
-                    logger.debug("未知的orders响应格式", 
-                               response_type=type(orders_response).__name__,
-                               account_index=account_index,
-                               response_attrs=[attr for attr in dir(orders_response) if not attr.startswith('_')][:5])
+                                   response_attrs=_public_attr_names(orders_response)[:5])
                     return []
-            else:
+                self._orders_extractor = extractor
+            
+            try:
+                return extractor(orders_response)
+            except Exception as e:
+                # 响应结构与首次不一致时重新检测
+                self._orders_extractor = None
+                logger.debug("提取orders列表失败", 
+                           response_type=type(orders_response).__name__,
+                           account_index=account_index,
+                           error=str(e))
                 return []
             
         except Exception as e:
@@ -3145,40 +3372,6 @@ class BalancedHedgeStrategy:
                         error=str(e))
             return []
     
-    async def _cancel_order_safely(self, account_index: int, order_id: str, order=None) -> bool:
-        """安全地取消订单"""
-        try:
-            if not self.client_factory:
-                logger.debug("client_factory不可用", account_index=account_index)
-                return False
-            
-            # 通过SignerClient取消订单
-            signer_client = await self.client_factory.get_signer_client(account_index)
-            if not signer_client:
-                logger.debug("SignerClient不可用", account_index=account_index)
-                return False
-            
-            # 取消订单
-            result = await signer_client.cancel_order(order_id)
-            
-            if result:
-                logger.debug("订单取消成功", 
-                           account_index=account_index,
-                           order_id=order_id)
-                return True
-            else:
-                logger.debug("订单取消失败", 
-                           account_index=account_index,
-                           order_id=order_id)
-                return False
-            
-        except Exception as e:
-            logger.debug("取消订单时出错",
-                        account_index=account_index,
-                        order_id=order_id,
-                        error=str(e))
-            return False
-    
     async def _cleanup_all_positions(self, pair_config: TradingPairConfig, accounts: List[int]) -> bool:
         """
         平掉所有相关账户的仓位
@@ -3200,15 +3393,14 @@ class BalancedHedgeStrategy:
             all_success = True
             total_closed = 0
             
-            for account_index in accounts:
+            # 并发查询所有账户在指定市场的仓位
+            positions_by_account = await asyncio.gather(*(
+                self._get_account_positions(account_index, pair_config.market_index)
+                for account_index in accounts
+            ))
+            
+            for account_index, positions in zip(accounts, positions_by_account):
                 try:
-                    logger.debug("📋 检查账户仓位",
-                               account_index=account_index,
-                               market_index=pair_config.market_index)
-                    
-                    # 获取该账户在指定市场的所有仓位
-                    positions = await self._get_account_positions(account_index, pair_config.market_index)
-                    
                     if not positions:
                         logger.info("✅ 账户无仓位", account_index=account_index)
                         continue
@@ -3216,16 +3408,19 @@ class BalancedHedgeStrategy:
                     logger.info("🎯 发现需要清理的仓位",
                                account_index=account_index,
                                positions_count=len(positions),
-                               positions=[{
-                                   'side': getattr(p, 'side', 'unknown'),
-                                   'size': float(getattr(p, 'size', 0)),
-                                   'entry_price': float(getattr(p, 'entry_price', 0))
-                               } for p in positions])
+                               positions=_position_objects_log_detail(positions) if logger.isEnabledFor(logging.INFO) else None)
                     
-                    # 逐个平仓
-                    account_closed = 0
-                    for position in positions:
+                    async def _close_one(position) -> Optional[bool]:
+                        """平掉单个仓位；仓位为0或不在清理范围内时返回None"""
                         try:
+                            # 交易所/WebSocket仓位在清理中不自动平仓，保持原有行为；是否改为平仓需单独评审
+                            if isinstance(position, ParsedPosition):
+                                logger.info("交易所仓位不在自动清理范围内，跳过",
+                                           account_index=account_index,
+                                           side=position.side,
+                                           size=position.size)
+                                return None
+                            
                             position_size = getattr(position, 'size', 0)
                             position_side = getattr(position, 'side', '')
                             
@@ -3233,7 +3428,7 @@ class BalancedHedgeStrategy:
                                 logger.info("仓位大小为0，跳过", 
                                            account_index=account_index,
                                            position=str(position)[:100])
-                                continue
+                                return None
                             
                             # 确定平仓方向（与开仓方向相反）
                             close_side = 'sell' if position_side.lower() == 'long' else 'buy'
@@ -3248,8 +3443,6 @@ class BalancedHedgeStrategy:
                             )
                             
                             if close_success:
-                                account_closed += 1
-                                total_closed += 1
                                 logger.info("✅ 成功平仓",
                                            account_index=account_index,
                                            side=position_side,
@@ -3261,14 +3454,23 @@ class BalancedHedgeStrategy:
                                              account_index=account_index,
                                              side=position_side,
                                              size=float(position_size))
-                                all_success = False
+                            return close_success
                                 
                         except Exception as e:
                             logger.error("平单个仓位时出错",
                                        account_index=account_index,
                                        position=str(position)[:100],
                                        error=str(e))
-                            all_success = False
+                            return False
+                    
+                    # 逐个平仓
+                    close_results = []
+                    for position in positions:
+                        close_results.append(await _close_one(position))
+                    account_closed = sum(1 for r in close_results if r)
+                    total_closed += account_closed
+                    if any(r is False for r in close_results):
+                        all_success = False
                     
                     logger.info("📊 账户仓位清理完成",
                                account_index=account_index,
@@ -3302,6 +3504,15 @@ class BalancedHedgeStrategy:
     async def _get_account_positions(self, account_index: int, market_index: int) -> List:
         """获取账户在指定市场的所有仓位"""
         try:
+            # 方法0: WebSocket刚推送过的仓位足够新鲜，无需再查询交易所
+            cached_positions = self._get_fresh_cached_positions(account_index, market_index)
+            if cached_positions is not None:
+                logger.debug("使用WebSocket仓位缓存",
+                           account_index=account_index,
+                           market_index=market_index,
+                           positions_count=len(cached_positions))
+                return cached_positions
+            
             logger.info("🔍 开始直接查询交易所仓位",
                        account_index=account_index,
                        market_index=market_index)
@@ -3313,11 +3524,7 @@ class BalancedHedgeStrategy:
                 logger.info("✅ 直接API查询到仓位",
                            account_index=account_index,
                            positions_count=len(direct_positions),
-                           positions=[{
-                               'side': getattr(p, 'side', 'unknown'),
-                               'size': float(getattr(p, 'size', 0)),
-                               'market': getattr(p, 'market_index', 'unknown')
-                           } for p in direct_positions])
+                           positions=_position_objects_log_detail(direct_positions) if logger.isEnabledFor(logging.INFO) else None)
                 return direct_positions
             
             # 方法2: 通过账户管理器获取（作为备用）
@@ -3334,11 +3541,7 @@ class BalancedHedgeStrategy:
                 logger.info("📋 账户管理器查询结果",
                            account_index=account_index,
                            total_positions=len(all_positions),
-                           all_positions=[{
-                               'side': getattr(p, 'side', 'unknown'),
-                               'size': float(getattr(p, 'size', 0)),
-                               'market': getattr(p, 'market_index', 'unknown')
-                           } for p in all_positions])
+                           all_positions=_position_objects_log_detail(all_positions) if logger.isEnabledFor(logging.INFO) else None)
                 
                 # 过滤指定市场的仓位
                 market_positions = [p for p in all_positions 
@@ -3394,8 +3597,12 @@ class BalancedHedgeStrategy:
                            side=side,
                            amount=float(amount))
                 
-                # 等待订单执行（简单等待，实际项目中可能需要更复杂的确认机制）
-                await asyncio.sleep(1)
+                # 等待成交确认；市价减仓单超时未确认也视为已提交，由后续仓位查询兜底
+                filled = await self.order_manager.wait_fill(order.id, timeout=1.0)
+                if not filled:
+                    logger.debug("平仓订单成交确认超时",
+                               account_index=account_index,
+                               order_id=order.id)
                 return True
             else:
                 logger.warning("❌ 平仓订单创建失败",
@@ -3412,8 +3619,8 @@ class BalancedHedgeStrategy:
                         error=str(e))
             return False
     
-    async def _get_positions_from_exchange_api(self, account_index: int, market_index: int) -> List:
-        """直接从交易所API获取仓位数据"""
+    async def _get_positions_from_exchange_api(self, account_index: int, market_index: int) -> List[ParsedPosition]:
+        """直接从交易所API获取仓位数据，解析为ParsedPosition列表"""
         try:
             logger.info("🌐 直接查询交易所API获取仓位",
                        account_index=account_index,
@@ -3426,188 +3633,164 @@ class BalancedHedgeStrategy:
             # 获取账户API
             account_api = self.client_factory.get_account_api()
             
-            # 获取认证令牌
-            auth_token = None
-            try:
-                signer_client = await self.client_factory.get_signer_client(account_index)
-                if signer_client:
-                    auth_result, auth_error = signer_client.create_auth_token_with_expiry()
-                    if auth_result and not auth_error:
-                        auth_token = auth_result
-                        logger.debug("✅ 获取认证令牌成功", account_index=account_index)
-                    else:
-                        logger.warning("⚠️ 认证令牌创建失败", 
-                                     account_index=account_index, 
-                                     error=auth_error)
-                else:
-                    logger.warning("⚠️ SignerClient不可用", account_index=account_index)
-            except Exception as e:
-                logger.warning("⚠️ 获取认证令牌失败", 
-                             account_index=account_index, 
-                             error=str(e))
-            
             # 查询账户信息（包含仓位）
-            try:
-                logger.info("📡 调用账户API查询仓位",
-                           account_index=account_index,
-                           has_auth=bool(auth_token))
-                
-                # 调用账户API，不传递auth参数（认证通过SignerClient处理）
-                account_response = await account_api.account(
-                    by="index",
-                    value=str(account_index)
-                )
-                
-                # 解析响应
-                if not account_response:
-                    logger.warning("⚠️ API返回空响应", account_index=account_index)
-                    return []
-                
-                logger.info("📡 API响应接收成功",
-                           account_index=account_index,
-                           response_type=type(account_response).__name__,
-                           has_accounts=hasattr(account_response, 'accounts'))
-                
-                if not hasattr(account_response, 'accounts') or not account_response.accounts:
-                    logger.warning("⚠️ API响应中无accounts数据", account_index=account_index)
-                    return []
-                
-                account_data = account_response.accounts[0]
+            logger.info("📡 调用账户API查询仓位",
+                       account_index=account_index)
+            
+            # 账户查询是公开接口，无需认证令牌
+            account_response = await account_api.account(
+                by="index",
+                value=str(account_index)
+            )
+            
+            # 解析响应
+            if not account_response:
+                logger.warning("⚠️ API返回空响应", account_index=account_index)
+                return []
+            
+            logger.info("📡 API响应接收成功",
+                       account_index=account_index,
+                       response_type=type(account_response).__name__,
+                       has_accounts=hasattr(account_response, 'accounts'))
+            
+            if not hasattr(account_response, 'accounts') or not account_response.accounts:
+                logger.warning("⚠️ API响应中无accounts数据", account_index=account_index)
+                return []
+            
+            account_data = account_response.accounts[0]
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
                 logger.debug("📊 解析账户数据",
                            account_index=account_index,
                            account_type=type(account_data).__name__,
                            has_positions=hasattr(account_data, 'positions'),
-                           account_attrs=[attr for attr in dir(account_data) if not attr.startswith('_')][:10])
+                           account_attrs=_public_attr_names(account_data)[:10])
+            
+            # 解析仓位数据
+            positions = []
+            if hasattr(account_data, 'positions') and account_data.positions:
+                logger.debug("📋 发现仓位数据",
+                           account_index=account_index,
+                           positions_count=len(account_data.positions) if hasattr(account_data.positions, '__len__') else 'unknown',
+                           positions_type=type(account_data.positions).__name__)
                 
-                # 解析仓位数据
-                positions = []
-                if hasattr(account_data, 'positions') and account_data.positions:
-                    logger.debug("📋 发现仓位数据",
-                               account_index=account_index,
-                               positions_count=len(account_data.positions) if hasattr(account_data.positions, '__len__') else 'unknown',
-                               positions_type=type(account_data.positions).__name__)
-                    
-                    # 处理仓位数据
-                    position_list = account_data.positions
-                    if hasattr(position_list, '__iter__'):
-                        for i, pos_data in enumerate(position_list):
-                            try:
+                # 处理仓位数据
+                position_list = account_data.positions
+                if hasattr(position_list, '__iter__'):
+                    for i, pos_data in enumerate(position_list):
+                        try:
+                            if debug_enabled:
                                 logger.debug("🔍 解析单个仓位",
                                            account_index=account_index,
                                            position_index=i,
                                            position_type=type(pos_data).__name__,
-                                           position_attrs=[attr for attr in dir(pos_data) if not attr.startswith('_')][:10])
-                                
-                                # 提取仓位信息 - 尝试多种可能的字段名
-                                position_market = None
-                                for field_name in ['market_index', 'market_id', 'market', 'marketIndex']:
-                                    if hasattr(pos_data, field_name):
-                                        field_value = getattr(pos_data, field_name)
-                                        if field_value is not None:
-                                            position_market = int(field_value)
-                                            break
-                                
-                                if position_market is None:
-                                    position_market = 0  # 默认值
-                                
-                                # 根据官方文档解析仓位大小和方向
-                                position_size = None
-                                size_field_used = None
-                                position_sign = None
-                                
-                                # 获取position字段（主要的仓位大小）
-                                if hasattr(pos_data, 'position'):
-                                    position_str = getattr(pos_data, 'position')
-                                    if position_str is not None:
-                                        try:
-                                            position_size = float(position_str) if isinstance(position_str, str) else position_str
-                                            size_field_used = 'position'
-                                        except (ValueError, TypeError):
-                                            position_size = 0
-                                            size_field_used = 'position(invalid)'
-                                
-                                # 获取sign字段（仓位方向）
-                                if hasattr(pos_data, 'sign'):
-                                    position_sign = getattr(pos_data, 'sign')
-                                
-                                # 如果没有position字段，尝试其他字段
-                                if position_size is None or position_size == 0:
-                                    for size_field in ['position_value', 'allocated_margin', 'size', 'amount']:
-                                        if hasattr(pos_data, size_field):
-                                            potential_size = getattr(pos_data, size_field)
-                                            logger.debug("🔍 检查备用大小字段",
-                                                       field_name=size_field,
-                                                       field_value=potential_size,
-                                                       field_type=type(potential_size).__name__)
-                                            if potential_size is not None:
-                                                try:
-                                                    potential_value = float(potential_size) if isinstance(potential_size, str) else potential_size
-                                                    if potential_value != 0:
-                                                        position_size = potential_value
-                                                        size_field_used = size_field
-                                                        break
-                                                except (ValueError, TypeError):
-                                                    continue
-                                
-                                if position_size is None:
-                                    position_size = 0
-                                    size_field_used = 'default'
-                                
-                                # 根据sign确定仓位方向
-                                if position_sign == 1:
-                                    position_side = 'long'
-                                elif position_sign == -1:
-                                    position_side = 'short'
-                                else:
-                                    position_side = getattr(pos_data, 'side', 'unknown')
-                                
-                                logger.info("📈 仓位详情",
+                                           position_attrs=_public_attr_names(pos_data)[:10])
+                            
+                            market_fields, has_position, has_sign, size_fields = _position_fields(pos_data)
+                            
+                            # 提取仓位信息 - 尝试多种可能的字段名
+                            position_market = None
+                            for field_name in market_fields:
+                                field_value = getattr(pos_data, field_name)
+                                if field_value is not None:
+                                    position_market = int(field_value)
+                                    break
+                            
+                            if position_market is None:
+                                position_market = 0  # 默认值
+                            
+                            # 非目标市场的仓位直接跳过，不再解析大小方向和记录日志
+                            if position_market != market_index:
+                                continue
+                            
+                            # 根据官方文档解析仓位大小和方向
+                            position_size = None
+                            size_field_used = None
+                            position_sign = None
+                            
+                            # 获取position字段（主要的仓位大小）
+                            if has_position:
+                                position_str = pos_data.position
+                                if position_str is not None:
+                                    position_size = _to_float(position_str, None)
+                                    if position_size is None:
+                                        position_size = 0
+                                        size_field_used = 'position(invalid)'
+                                    else:
+                                        size_field_used = 'position'
+                            
+                            # 获取sign字段（仓位方向）
+                            if has_sign:
+                                position_sign = pos_data.sign
+                            
+                            # 如果没有position字段，尝试其他字段
+                            if position_size is None or position_size == 0:
+                                for size_field in size_fields:
+                                    potential_size = getattr(pos_data, size_field)
+                                    if debug_enabled:
+                                        logger.debug("🔍 检查备用大小字段",
+                                                   field_name=size_field,
+                                                   field_value=potential_size,
+                                                   field_type=type(potential_size).__name__)
+                                    potential_value = _to_float(potential_size, None)
+                                    if potential_value:
+                                        position_size = potential_value
+                                        size_field_used = size_field
+                                        break
+                            
+                            if position_size is None:
+                                position_size = 0
+                                size_field_used = 'default'
+                            
+                            # 根据sign确定仓位方向
+                            position_side = _side_from_sign(position_sign, getattr(pos_data, 'side', 'unknown'))
+                            
+                            logger.info("📈 仓位详情",
+                                       account_index=account_index,
+                                       position_index=i,
+                                       market_index=position_market,
+                                       size=position_size,
+                                       side=position_side,
+                                       size_field_used=size_field_used,
+                                       position_sign=position_sign,
+                                       target_market=market_index)
+                            
+                            # 只返回有大小的仓位；备用字段是USD/保证金数值而非基础资产数量，方向不明的仓位也无法确定平仓方向，均不返回
+                            if position_size and (size_field_used != 'position' or position_sign not in (1, -1)):
+                                logger.warning("⚠️ 仓位数量或方向无法确定，跳过",
+                                             account_index=account_index,
+                                             market_index=position_market,
+                                             size_field_used=size_field_used,
+                                             position_sign=position_sign)
+                            elif position_size:
+                                positions.append(ParsedPosition(
+                                    position_market, position_size, position_side, position_sign
+                                ))
+                                logger.info("✅ 找到目标仓位",
                                            account_index=account_index,
-                                           position_index=i,
                                            market_index=position_market,
                                            size=position_size,
-                                           side=position_side,
-                                           size_field_used=size_field_used,
-                                           position_sign=position_sign,
-                                           target_market=market_index)
-                                
-                                # 只返回指定市场且有大小的仓位
-                                if (position_market == market_index and 
-                                    position_size and 
-                                    abs(float(position_size)) > 0):
-                                    
-                                    positions.append(pos_data)
-                                    logger.info("✅ 找到目标仓位",
-                                               account_index=account_index,
-                                               market_index=position_market,
-                                               size=position_size,
-                                               side=position_side)
-                                
-                            except Exception as e:
-                                logger.error("❌ 解析单个仓位失败",
-                                           account_index=account_index,
-                                           position_index=i,
-                                           error=str(e))
-                    else:
-                        logger.warning("⚠️ 仓位数据不可迭代",
-                                     account_index=account_index,
-                                     positions_type=type(position_list).__name__)
+                                           side=position_side)
+                            
+                        except Exception as e:
+                            logger.error("❌ 解析单个仓位失败",
+                                       account_index=account_index,
+                                       position_index=i,
+                                       error=str(e))
                 else:
-                    logger.debug("ℹ️ 账户无仓位数据", account_index=account_index)
-                
-                logger.info("📊 仓位查询完成",
-                           account_index=account_index,
-                           found_positions=len(positions),
-                           target_market=market_index)
-                
-                return positions
-                
-            except Exception as e:
-                logger.error("❌ 调用账户API失败",
-                           account_index=account_index,
-                           error=str(e))
-                return []
+                    logger.warning("⚠️ 仓位数据不可迭代",
+                                 account_index=account_index,
+                                 positions_type=type(position_list).__name__)
+            else:
+                logger.debug("ℹ️ 账户无仓位数据", account_index=account_index)
             
+            logger.info("📊 仓位查询完成",
+                       account_index=account_index,
+                       found_positions=len(positions),
+                       target_market=market_index)
+            
+            return positions
+                
         except Exception as e:
             logger.error("❌ 直接API查询仓位失败",
                         account_index=account_index,
@@ -3785,7 +3968,8 @@ class BalancedHedgeStrategy:
                     else:
                         error_msg = 'Order creation failed' if not close_result else f'Order status: {close_result.status}'
                         # 检查是否是因为数量太小导致的失败
-                        if abs(position_size) < 0.000001 and ('minimum' in str(error_msg).lower() or 'size' in str(error_msg).lower()):
+                        error_msg_lower = error_msg.lower()
+                        if abs(position_size) < 0.000001 and ('minimum' in error_msg_lower or 'size' in error_msg_lower):
                             logger.warning("⚠️ 极小仓位无法平仓（可能低于最小交易数量）",
                                          account_index=account_index,
                                          position_size=position_size,
@@ -3832,11 +4016,7 @@ class BalancedHedgeStrategy:
                        market_index=market_index,
                        total_remaining_positions=len(all_remaining_positions) if all_remaining_positions else 0,
                        target_market_remaining=remaining_count,
-                       remaining_details=[{
-                           'side': getattr(p, 'side', 'unknown'),
-                           'size': float(getattr(p, 'size', 0)),
-                           'market': getattr(p, 'market_index', getattr(p, 'market', 'unknown'))
-                       } for p in remaining_positions])
+                       remaining_details=_position_objects_log_detail(remaining_positions) if logger.isEnabledFor(logging.INFO) else None)
             
             if remaining_count == 0:
                 logger.info("✅ 账户仓位清理完成",
@@ -0,0 +1,13 @@
+"""
+Event loop policy setup for Lighter Hedge Trading System
+"""
+
+import asyncio
+import sys
+
+
+def install_uvloop() -> None:
+    """非Windows平台使用uvloop事件循环（uvloop在这些平台上是必需依赖），Windows保持标准asyncio"""
+    if sys.platform != "win32":
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
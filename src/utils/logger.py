@@ -2,21 +2,71 @@
 Structured logging configuration for Lighter Hedge Trading System
 """
 
+import atexit
+import functools
 import structlog
 import logging
 import sys
+import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, TextIO, Tuple
 import colorama
 from colorama import Fore, Style
 from datetime import datetime
-import pytz
 
 # Initialize colorama for colored console output
 colorama.init()
 
-# 北京时区
-BEIJING_TZ = pytz.timezone('Asia/Shanghai')
+# 北京时区：优先使用标准库zoneinfo（3.9+），旧版本或缺少时区数据（如Windows未装tzdata）时退回pytz
+try:
+    from zoneinfo import ZoneInfo
+    BEIJING_TZ = ZoneInfo('Asia/Shanghai')
+except (ImportError, KeyError):
+    import pytz
+    BEIJING_TZ = pytz.timezone('Asia/Shanghai')
+
+# 最近一次格式化的北京时间（精度为秒）: (epoch秒, 格式化字符串)
+_last_timestamp: Tuple[int, str] = (-1, "")
+
+
+def _beijing_timestamp(epoch_seconds: float) -> str:
+    """格式化北京时间，同一秒内复用上次结果"""
+    global _last_timestamp
+    sec = int(epoch_seconds)
+    cached_sec, cached_text = _last_timestamp
+    if sec == cached_sec:
+        return cached_text
+    text = datetime.fromtimestamp(sec, tz=BEIJING_TZ).strftime("%Y-%m-%d %H:%M:%S")
+    _last_timestamp = (sec, text)
+    return text
+
+
+# 控制台输出模板缓存: (event, 字段名元组) -> str.format模板
+_TEMPLATE_CACHE: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+_TEMPLATE_CACHE_MAX_SIZE = 1024
+
+# 日志级别对应的控制台颜色
+_LEVEL_COLORS = {
+    "DEBUG": Fore.CYAN,
+    "INFO": Fore.GREEN,
+    "WARNING": Fore.YELLOW,
+    "ERROR": Fore.RED,
+    "CRITICAL": Fore.RED + Style.BRIGHT,
+}
+
+# 降低到WARNING级别的第三方logger（WebSocket及其他噪音较大的库）
+# 需要静音新的库时加到这里，由setup_logging统一处理，不要另写getLogger循环
+_QUIET_LOGGERS = (
+    'websockets.client',
+    'websockets.server',
+    'websockets.protocol',
+    'websockets',
+    'lighter.ws_client',
+    'lighter.client',
+    'aiohttp.access',
+    'urllib3.connectionpool',
+    'asyncio',
+)
 
 
 def setup_logging(log_level: str = "INFO", log_dir: str = "logs") -> None:
@@ -28,9 +78,7 @@ def setup_logging(log_level: str = "INFO", log_dir: str = "logs") -> None:
     # Configure standard library logging for file output only
     class BeijingFormatter(logging.Formatter):
         def formatTime(self, record, datefmt=None):
-            from datetime import datetime
-            dt = datetime.fromtimestamp(record.created, tz=BEIJING_TZ)
-            return dt.strftime('%Y-%m-%d %H:%M:%S')
+            return _beijing_timestamp(record.created)
         
         def format(self, record):
             # Remove logger name (module path)
@@ -55,64 +103,31 @@ def setup_logging(log_level: str = "INFO", log_dir: str = "logs") -> None:
     root_logger.addHandler(file_handler_app)
     root_logger.addHandler(file_handler_error)
     
-    # Reduce WebSocket logging noise
-    websocket_loggers = [
-        'websockets.client',
-        'websockets.server', 
-        'websockets.protocol',
-        'websockets',
-        'lighter.ws_client',
-        'lighter.client'
-    ]
-    
-    for logger_name in websocket_loggers:
-        logger = logging.getLogger(logger_name)
-        logger.setLevel(logging.WARNING)  # Only show warnings and errors
-    
-    # Reduce other noisy loggers
-    noisy_loggers = [
-        'aiohttp.access',
-        'urllib3.connectionpool',
-        'asyncio'
-    ]
-    
-    for logger_name in noisy_loggers:
-        logger = logging.getLogger(logger_name)
-        logger.setLevel(logging.WARNING)
+    # Reduce WebSocket and other noisy loggers: only show warnings and errors
+    for logger_name in _QUIET_LOGGERS:
+        logging.getLogger(logger_name).setLevel(logging.WARNING)
     
     # Custom processor for Beijing time
     def add_beijing_timestamp(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
         """Add Beijing time timestamp"""
-        beijing_time = datetime.now(BEIJING_TZ)
-        event_dict["timestamp"] = beijing_time.strftime("%Y-%m-%d %H:%M:%S")
+        event_dict["timestamp"] = _beijing_timestamp(time.time())
         return event_dict
     
-    # Custom processor for colored console output  
+    # Custom processor for colored console output
+    # 终端检测和颜色表在配置时确定一次，不在每条日志中重复计算
+    is_tty = sys.stderr.isatty()
+    
     def add_color(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
-        if not sys.stderr.isatty():
+        if not is_tty:
             return event_dict
             
         level = event_dict.get("level", "").upper()
-        colors = {
-            "DEBUG": Fore.CYAN,
-            "INFO": Fore.GREEN,
-            "WARNING": Fore.YELLOW,
-            "ERROR": Fore.RED,
-            "CRITICAL": Fore.RED + Style.BRIGHT,
-        }
-        
-        color = colors.get(level, "")
+        color = _LEVEL_COLORS.get(level, "")
         if color:
             event_dict["level"] = f"{color}{level}{Style.RESET_ALL}"
             
         return event_dict
     
-    # Custom processor to remove logger name (file path)
-    def remove_logger_name(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
-        """Remove logger name (file path) from output"""
-        event_dict.pop("logger", None)
-        return event_dict
-    
     # 简洁的控制台渲染器
     def console_renderer(logger, method_name, event_dict):
         """Clean console renderer without duplication"""
@@ -120,18 +135,26 @@ def setup_logging(log_level: str = "INFO", log_dir: str = "logs") -> None:
         level = event_dict.pop("level", "INFO").upper()
         event = event_dict.pop("event", "")
         
-        # 构建参数字符串
-        params = []
-        for key, value in event_dict.items():
-            if key not in ["logger", "level", "timestamp"]:
-                params.append(f"{key}={value}")
-        
-        param_str = " ".join(params)
+        # 同一事件的字段组合通常固定，缓存格式模板后只需绑定字段值
+        keys = tuple(event_dict)
+        cache_key = (event, keys)
+        template = _TEMPLATE_CACHE.get(cache_key) if isinstance(event, str) else None
+        if template is None:
+            if not isinstance(event, str) or not all(key.isidentifier() for key in keys):
+                params = " ".join(f"{key}={value}" for key, value in event_dict.items())
+                message = f"{timestamp} [{level}] {event} {params}" if params else f"{timestamp} [{level}] {event}"
+                print(message)
+                return message
+            
+            escaped_event = event.replace("{", "{{").replace("}", "}}")
+            template = "{0} [{1}] " + escaped_event
+            if keys:
+                template += " " + " ".join(f"{key}={{{key}}}" for key in keys)
+            if len(_TEMPLATE_CACHE) >= _TEMPLATE_CACHE_MAX_SIZE:
+                _TEMPLATE_CACHE.clear()
+            _TEMPLATE_CACHE[cache_key] = template
         
-        if param_str:
-            message = f"{timestamp} [{level}] {event} {param_str}"
-        else:
-            message = f"{timestamp} [{level}] {event}"
+        message = template.format(timestamp, level, **event_dict)
         
         # 直接输出到console，不通过logging模块
         print(message)
@@ -139,13 +162,13 @@ def setup_logging(log_level: str = "INFO", log_dir: str = "logs") -> None:
     
     # Configure structlog for console output only
     structlog.configure(
+        # 每条日志都会依次经过所有处理器，只保留实际生效的环节：
+        # 未使用add_logger_name和stack_info，因此无需移除logger名或渲染调用栈
         processors=[
             structlog.stdlib.filter_by_level,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
             add_beijing_timestamp,  # 添加北京时间
-            remove_logger_name,     # 移除文件名信息
-            structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             console_renderer,       # 使用控制台渲染器
         ],
@@ -156,8 +179,11 @@ def setup_logging(log_level: str = "INFO", log_dir: str = "logs") -> None:
     )
 
 
+@functools.lru_cache(maxsize=None)
 def get_logger(name: str = None) -> structlog.BoundLogger:
-    """Get a structured logger instance"""
+    """Get a structured logger instance (one shared instance per name)"""
+    # structlog返回的是惰性代理，首次使用时才按当前配置绑定，
+    # 因此在setup_logging之前缓存也是安全的
     return structlog.get_logger(name or __name__)
 
 
@@ -168,6 +194,16 @@ class TradeLogger:
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.logger = get_logger("trading")
+        # trades.log 在首次写入时打开并保持，避免每笔交易重复打开/关闭文件
+        self._trades_file: Optional[TextIO] = None
+    
+    def _write_trade_record(self, position_data: Dict[str, Any]) -> None:
+        """Append a record to the dedicated trades file"""
+        if self._trades_file is None:
+            # 行缓冲：每条记录写完即落盘，同时省去open/close
+            self._trades_file = open(self.log_dir / "trades.log", "a", encoding='utf-8', buffering=1)
+            atexit.register(self._trades_file.close)
+        self._trades_file.write(f"{position_data}\n")
     
     def log_trade_opportunity(self, pair_id: str, opportunity_data: Dict[str, Any]) -> None:
         """Log a trading opportunity"""
@@ -186,8 +222,7 @@ class TradeLogger:
         )
         
         # Also log to dedicated trades file
-        with open(self.log_dir / "trades.log", "a", encoding='utf-8') as f:
-            f.write(f"{position_data}\n")
+        self._write_trade_record(position_data)
     
     def log_position_close(self, position_data: Dict[str, Any]) -> None:
         """Log position closing"""
@@ -198,8 +233,7 @@ class TradeLogger:
         )
         
         # Also log to dedicated trades file
-        with open(self.log_dir / "trades.log", "a", encoding='utf-8') as f:
-            f.write(f"{position_data}\n")
+        self._write_trade_record(position_data)
     
     def log_risk_event(self, event_data: Dict[str, Any]) -> None:
         """Log risk management events"""
@@ -3,21 +3,120 @@ Web Server for Lighter Hedge Trading System
 """
 
 import asyncio
-from typing import Optional, Dict, Any
+import hashlib
+import operator
+import time
+from decimal import Decimal
+from enum import Enum
+from typing import Optional, Dict, Any, AsyncIterator, List, Set, Tuple
 from datetime import datetime
+from pathlib import Path
+import orjson
 import structlog
-from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 import uvicorn
 
 from src.config.config_manager import ConfigManager
 from src.core.hedge_trading_engine import HedgeTradingEngine
-from src.models import SystemStatus
+from src.models import HedgePosition, MarketData, SystemStatus
 
 logger = structlog.get_logger()
 
 
+def _orjson_default(obj: Any) -> Any:
+    """orjson不支持的类型转换"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"无法序列化类型: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """使用orjson序列化的JSON响应（datetime原生输出ISO格式）
+    
+    大负载接口直接返回该响应实例，跳过FastAPI对返回值的jsonable_encoder逐字段转换
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+# 最近一次生成的状态时间戳（精度为秒）: (epoch秒, ISO字符串)
+_last_status_timestamp: Tuple[int, str] = (-1, "")
+
+
+def _status_timestamp() -> str:
+    """返回当前时间的ISO字符串，同一秒内复用上次结果"""
+    global _last_status_timestamp
+    sec = int(time.time())
+    if sec != _last_status_timestamp[0]:
+        _last_status_timestamp = (sec, datetime.fromtimestamp(sec).isoformat())
+    return _last_status_timestamp[1]
+
+
+_CREATED_AT_TS_KEY = operator.itemgetter('created_at_ts')
+
+
+def _order_sort_ts(created_at: Any) -> float:
+    """将API订单的创建时间（epoch秒/毫秒、ISO字符串或datetime）转为epoch秒，无法解析时返回0"""
+    if isinstance(created_at, datetime):
+        return created_at.timestamp()
+    if isinstance(created_at, (int, float)):
+        # 毫秒时间戳转为秒
+        return created_at / 1000 if created_at > 1e12 else float(created_at)
+    if isinstance(created_at, str):
+        try:
+            return datetime.fromisoformat(created_at.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+# 订单响应每个分块包含的订单数
+_ORDERS_PER_CHUNK = 200
+
+
+def _encode_orders_json(orders: List[Dict[str, Any]], summary: Dict[str, Any]) -> Tuple[List[bytes], str]:
+    """逐条序列化订单列表，按分块返回完整的订单响应JSON，同时计算整个响应体的ETag"""
+    digest = hashlib.blake2b(digest_size=8)
+    chunks = [b'{"status":"success","data":[']
+    for start in range(0, len(orders), _ORDERS_PER_CHUNK):
+        chunk = b','.join(
+            orjson.dumps(order, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+            for order in orders[start:start + _ORDERS_PER_CHUNK]
+        )
+        chunks.append(b',' + chunk if start else chunk)
+    chunks.append(b'],"summary":' + orjson.dumps(summary) + b'}')
+    for chunk in chunks:
+        digest.update(chunk)
+    return chunks, '"' + digest.hexdigest() + '"'
+
+
+# 轮询类只读接口的响应缓存有效期（秒）
+_ACCOUNTS_CACHE_TTL_SECONDS = 1.0
+_TRADING_PAIRS_CACHE_TTL_SECONDS = 10.0
+_CONFIG_CACHE_TTL_SECONDS = 10.0
+_MARKET_DATA_CACHE_TTL_SECONDS = 1.0
+_POSITIONS_CACHE_TTL_SECONDS = 1.0
+
+# 实时推送（SSE）: 每个连接的待发送事件上限（慢客户端超出后丢弃，下一次推送会带上最新值），以及空闲保活间隔
+_STREAM_QUEUE_MAXSIZE = 256
+_STREAM_KEEPALIVE_SECONDS = 15.0
+# 行情推送合并窗口（秒）：窗口内同一市场只推送最新一笔
+_STREAM_FLUSH_INTERVAL_SECONDS = 0.15
+
+# 仪表盘页面运行期间不变，模块加载时读取一次并计算ETag
+_DASHBOARD_BYTES = (Path(__file__).parent / "static" / "dashboard.html").read_bytes()
+_DASHBOARD_ETAG = '"' + hashlib.blake2b(_DASHBOARD_BYTES, digest_size=8).hexdigest() + '"'
+
+
 class WebServer:
     """Web server for monitoring and control"""
     
@@ -27,10 +126,20 @@ class WebServer:
         self.app = FastAPI(
             title="Lighter Hedge Trading System",
             description="Advanced hedge trading system for Lighter Protocol",
-            version="1.0.0"
+            version="1.0.0",
+            default_response_class=ORJSONResponse
         )
         self.server: Optional[uvicorn.Server] = None
         self.server_task: Optional[asyncio.Task] = None
+        # 只读接口响应缓存: 接口名 -> (过期时间monotonic, 已序列化的响应体, ETag)
+        self._response_cache: Dict[str, Tuple[float, bytes, str]] = {}
+        # 仓位缓存对应的策略positions_version，版本变化时立即重建，不等TTL过期
+        self._positions_cache_version: Optional[int] = None
+        # 实时推送连接的事件队列
+        self._stream_queues: Set[asyncio.Queue] = set()
+        # 待推送的行情，按市场只保留最新值，由合并任务定期批量发送
+        self._pending_ticks: Dict[int, MarketData] = {}
+        self._stream_flush_task: Optional[asyncio.Task] = None
         
         self._setup_routes()
         self._setup_middleware()
@@ -47,160 +156,420 @@ class WebServer:
             allow_methods=["*"],
             allow_headers=["*"],
         )
+        # 轮询接口返回的JSON重复度高，超过阈值的响应体启用gzip压缩
+        self.app.add_middleware(GZipMiddleware, minimum_size=512)
+    
+    @staticmethod
+    def _etag_response(body: bytes, etag: str, request: Request) -> Response:
+        """客户端ETag与当前一致时返回304空响应，否则返回完整JSON"""
+        headers = {"ETag": etag}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    def _get_cached_body(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """返回未过期的缓存响应体和ETag，无缓存或已过期时返回None"""
+        cached = self._response_cache.get(key)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1], cached[2]
+        return None
+    
+    def _cache_body(self, key: str, payload: Dict[str, Any], ttl: float) -> Tuple[bytes, str]:
+        """序列化响应并缓存ttl秒，ETag随响应体一起计算一次"""
+        body = ORJSONResponse(payload).body
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        self._response_cache[key] = (time.monotonic() + ttl, body, etag)
+        return body, etag
+    
+    def _get_cached_response(self, key: str, request: Request) -> Optional[Response]:
+        """返回未过期的缓存响应，无缓存或已过期时返回None"""
+        cached = self._get_cached_body(key)
+        if cached is not None:
+            return self._etag_response(cached[0], cached[1], request)
+        return None
+    
+    def _cache_response(self, key: str, payload: Dict[str, Any], ttl: float, request: Request) -> Response:
+        """序列化响应并缓存ttl秒，返回带ETag的响应"""
+        body, etag = self._cache_body(key, payload, ttl)
+        return self._etag_response(body, etag, request)
+    
+    @staticmethod
+    def _market_data_row(data: MarketData) -> Dict[str, Any]:
+        """市场数据接口与实时推送共用的单个市场数据格式"""
+        return {
+            "market_index": data.market_index,
+            "price": float(data.price) if data.price else None,
+            "bid_price": float(data.bid_price) if data.bid_price else None,
+            "ask_price": float(data.ask_price) if data.ask_price else None,
+            "volume": float(data.volume_24h) if data.volume_24h else None,
+            "timestamp": data.timestamp,
+            "timestamp_ms": int(data.timestamp.timestamp() * 1000)
+        }
+    
+    def _on_market_data(self, market_data: MarketData) -> None:
+        """WebSocket行情回调：只记录每个市场的最新行情，实际推送由合并任务完成"""
+        if self._stream_queues:
+            self._pending_ticks[market_data.market_index] = market_data
+    
+    async def _flush_market_ticks(self) -> None:
+        """每个合并窗口把累积的行情编码一次，作为一个事件分发给所有推送连接"""
+        while True:
+            await asyncio.sleep(_STREAM_FLUSH_INTERVAL_SECONDS)
+            if not self._pending_ticks:
+                continue
+            ticks, self._pending_ticks = self._pending_ticks, {}
+            try:
+                rows = [self._market_data_row(data) for data in ticks.values()]
+                event = b"event: market\ndata: " + orjson.dumps(rows, default=_orjson_default) + b"\n\n"
+            except Exception as e:
+                logger.error("行情推送编码失败", error=str(e))
+                continue
+            for queue in self._stream_queues:
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    pass
+    
+    async def _stream_events(self, queue: asyncio.Queue) -> AsyncIterator[bytes]:
+        """逐条输出推送事件，空闲时发送保活注释；连接断开时注销队列"""
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self._stream_queues.discard(queue)
+    
+    @staticmethod
+    def _build_positions_payload(active_positions: List[Tuple[str, HedgePosition]]) -> List[Dict[str, Any]]:
+        """组装仓位接口的返回数据；仓位对象由事件循环持续更新，必须在事件循环线程中调用，不能交给线程池"""
+        positions = []
+        for position_id, hedge_pos in active_positions:
+            # 获取验证状态信息
+            metadata = hedge_pos.metadata
+            backend_validated = metadata.get('backend_validated', None)
+            close_validated = metadata.get('close_validated', None)
+            
+            # 状态/策略等枚举直接交给orjson原生输出其值，无需逐个访问.value
+            position_data = {
+                "id": position_id,
+                "pair_id": hedge_pos.pair_id,
+                "status": hedge_pos.status,
+                "strategy": hedge_pos.strategy,
+                "total_pnl": float(hedge_pos.total_pnl or 0),
+                "created_at": hedge_pos.created_at,
+                "created_at_ms": int(hedge_pos.created_at.timestamp() * 1000),
+                "updated_at": hedge_pos.updated_at or hedge_pos.created_at,
+                "positions": [],
+                "stop_loss_price": float(hedge_pos.stop_loss_price) if hedge_pos.stop_loss_price else None,
+                "take_profit_price": float(hedge_pos.take_profit_price) if hedge_pos.take_profit_price else None,
+                "metadata": metadata,
+                # 新增验证状态字段
+                "backend_validated": backend_validated,
+                "close_validated": close_validated,
+                "validation_timestamp": metadata.get('validation_timestamp'),
+                "validation_error": metadata.get('validation_error'),
+                "price_consistency_verified": metadata.get('price_consistency_verified', False),
+                "target_leverage": metadata.get('target_leverage', 1)
+            }
+            
+            # 添加详细仓位信息
+            positions_append = position_data["positions"].append
+            for pos in hedge_pos.positions:
+                # 每个字段只取值和转换一次，后续计算复用
+                size = pos.size
+                entry_price = pos.entry_price
+                current_price = pos.current_price
+                unrealized_pnl = float(pos.unrealized_pnl) if pos.unrealized_pnl else 0.0
+                liquidation_price = pos.liquidation_price
+                margin_ratio = pos.margin_ratio
+                
+                # 计算仓位价值和盈亏比例
+                position_value = float(size * current_price) if current_price else 0.0
+                entry_value = float(size * entry_price) if entry_price else 0.0
+                pnl_percentage = 0.0
+                if entry_value > 0:
+                    pnl_percentage = (unrealized_pnl / entry_value) * 100
+                
+                position_detail = {
+                    "account_index": pos.account_index,
+                    "side": pos.side,
+                    "amount": float(size),
+                    "entry_price": float(entry_price) if entry_price else None,
+                    "current_price": float(current_price) if current_price else None,
+                    "unrealized_pnl": unrealized_pnl,
+                    "market_index": pos.market_index,
+                    "leverage": pos.leverage,
+                    "margin_used": float(pos.margin_used),
+                    "position_value": position_value,
+                    "entry_value": entry_value,
+                    "pnl_percentage": pnl_percentage,
+                    "liquidation_price": float(liquidation_price) if liquidation_price else None,
+                    "margin_ratio": float(margin_ratio) if margin_ratio else None,
+                    "created_at": pos.created_at,
+                    "updated_at": pos.updated_at or pos.created_at
+                }
+                positions_append(position_detail)
+            
+            positions.append(position_data)
+        return positions
+    
+    def _status_body(self) -> bytes:
+        """系统状态接口的响应体（含秒级时间戳，不缓存）"""
+        status = self.trading_engine.get_system_status()
+        risk_summary = self.trading_engine.risk_manager.get_risk_summary()
+        
+        # pydantic直接输出系统状态的JSON，与风险摘要、时间戳拼接成响应体，不再构建中间dict
+        return b''.join((
+            b'{"status":"success","data":{"system":', status.model_dump_json().encode(),
+            b',"risk":', orjson.dumps(risk_summary, option=orjson.OPT_NON_STR_KEYS),
+            b',"timestamp":', orjson.dumps(_status_timestamp()),
+            b'}}'
+        ))
+    
+    def _positions_body(self) -> Tuple[bytes, str]:
+        """仓位接口的响应体和ETag；策略仓位版本变化时立即重建，否则按TTL缓存"""
+        strategy = getattr(self.trading_engine, 'balanced_hedge_strategy', None)
+        version = getattr(strategy, 'positions_version', None)
+        if version != self._positions_cache_version:
+            self._response_cache.pop("positions", None)
+            self._positions_cache_version = version
+        
+        cached = self._get_cached_body("positions")
+        if cached is not None:
+            return cached
+        
+        positions = []
+        
+        # 获取对冲仓位详细信息
+        if strategy and hasattr(strategy, 'active_positions'):
+            # 仓位对象由事件循环持续更新，必须在事件循环线程中组装，不能交给线程池
+            positions = self._build_positions_payload(list(strategy.active_positions.items()))
+        
+        return self._cache_body("positions", {
+            "status": "success",
+            "data": positions
+        }, _POSITIONS_CACHE_TTL_SECONDS)
+    
+    def _accounts_body(self) -> Tuple[bytes, str]:
+        """账户接口的响应体和ETag"""
+        cached = self._get_cached_body("accounts")
+        if cached is not None:
+            return cached
+        
+        accounts = []
+        for account in self.trading_engine.account_manager.accounts.values():
+            accounts.append({
+                "index": account.index,
+                "l1_address": account.l1_address,
+                "balance": float(account.balance),
+                "available_balance": float(account.available_balance),
+                "positions_count": len(account.positions),
+                "is_active": account.is_active,
+                "last_updated": account.last_updated
+            })
+        
+        return self._cache_body("accounts", {
+            "status": "success",
+            "data": accounts
+        }, _ACCOUNTS_CACHE_TTL_SECONDS)
+    
+    def _trading_pairs_body(self) -> Tuple[bytes, str]:
+        """交易对接口的响应体和ETag"""
+        cached = self._get_cached_body("trading_pairs")
+        if cached is not None:
+            return cached
+        
+        pairs = []
+        for pair in self.trading_engine.trading_pairs.values():
+            pairs.append({
+                "id": pair.id,
+                "name": pair.name,
+                "market_index": pair.market_index,
+                "is_enabled": pair.is_enabled,
+                "leverage": pair.leverage,
+                "max_positions": pair.max_positions,
+                "cooldown_minutes": pair.cooldown_minutes,
+                "hedge_strategy": pair.hedge_strategy
+            })
+        
+        return self._cache_body("trading_pairs", {
+            "status": "success",
+            "data": pairs
+        }, _TRADING_PAIRS_CACHE_TTL_SECONDS)
+    
+    def _market_data_body(self) -> Tuple[bytes, str]:
+        """市场数据接口的响应体和ETag"""
+        cached = self._get_cached_body("market_data")
+        if cached is not None:
+            return cached
+        
+        market_data = {}
+        
+        # 获取WebSocket管理器的市场数据
+        ws_manager = getattr(self.trading_engine, 'websocket_manager', None)
+        if ws_manager and hasattr(ws_manager, 'latest_market_data'):
+            for market_index, data in ws_manager.latest_market_data.items():
+                market_data[market_index] = self._market_data_row(data)
+        
+        return self._cache_body("market_data", {
+            "status": "success",
+            "data": market_data
+        }, _MARKET_DATA_CACHE_TTL_SECONDS)
+    
+    async def _collect_orders(self) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """汇总本地缓存和API中的订单，按创建时间倒序返回订单列表和数量统计"""
+        local_orders = []
+        api_orders = []
+        order_manager = getattr(self.trading_engine, 'order_manager', None)
+        
+        # 获取本地缓存的订单
+        if order_manager and hasattr(order_manager, 'orders'):
+            for order_id, order in order_manager.orders.items():
+                order_data = {
+                    "id": order_id,
+                    "account_index": order.account_index,
+                    "market_index": order.market_index,
+                    "order_type": order.order_type,
+                    "side": order.side,
+                    "amount": float(order.amount),
+                    "price": float(order.price),
+                    "status": order.status,
+                    "created_at": order.created_at,
+                    "created_at_ts": order.created_at.timestamp(),
+                    "filled_amount": float(order.filled_amount) if order.filled_amount else 0.0,
+                    "filled_price": float(order.filled_price) if order.filled_price else None,
+                    "filled_at": order.filled_at,
+                    "cancelled_at": getattr(order, 'cancelled_at', None),
+                    "sdk_order_id": order.sdk_order_id,
+                    "metadata": order.metadata if hasattr(order, 'metadata') else {},
+                    "source": "local_cache"
+                }
+                local_orders.append(order_data)
+        
+        # 获取API中的订单历史
+        if order_manager:
+            try:
+                # 获取所有活跃账户的订单
+                config_manager = getattr(order_manager, 'config_manager', None)
+                if config_manager:
+                    active_accounts = config_manager.get_active_accounts()
+                    
+                    # 并发获取各账户的所有订单（活跃+历史）
+                    results = await asyncio.gather(
+                        *(order_manager.get_all_account_orders_from_api(account.index) for account in active_accounts),
+                        return_exceptions=True
+                    )
+                    
+                    for account, account_orders in zip(active_accounts, results):
+                        if isinstance(account_orders, Exception):
+                            logger.warning("获取账户订单失败", 
+                                          account_index=account.index, 
+                                          error=str(account_orders))
+                            continue
+                        
+                        try:
+                            # 活跃订单和历史订单字段一致，ID前缀每个账户只拼接一次
+                            for orders_key, source in (('active_orders', 'api_active'), ('inactive_orders', 'api_inactive')):
+                                id_prefix = f"{source}_{account.index}_"
+                                for api_order in account_orders.get(orders_key, []):
+                                    get = api_order.get
+                                    created_at = get('created_at', 'unknown')
+                                    filled_price = get('filled_price')
+                                    api_orders.append({
+                                        "id": id_prefix + str(get('id', 'unknown')),
+                                        "account_index": account.index,
+                                        "market_index": get('market_id', 0),
+                                        "order_type": get('order_type', 'unknown'),
+                                        "side": get('side', 'unknown'),
+                                        "amount": float(get('amount', 0)),
+                                        "price": float(get('price', 0)),
+                                        "status": get('status', 'unknown'),
+                                        "created_at": created_at,
+                                        "created_at_ts": _order_sort_ts(created_at),
+                                        "filled_amount": float(get('filled_amount', 0)),
+                                        "filled_price": float(filled_price) if filled_price else None,
+                                        "filled_at": get('filled_at'),
+                                        "cancelled_at": get('cancelled_at'),
+                                        "sdk_order_id": get('id'),
+                                        "metadata": api_order,
+                                        "source": source
+                                    })
+                        
+                        except Exception as account_error:
+                            logger.warning("获取账户订单失败", 
+                                          account_index=account.index, 
+                                          error=str(account_error))
+            
+            except Exception as api_error:
+                logger.warning("从API获取订单失败", error=str(api_error))
+        
+        # 合并所有订单
+        all_orders = local_orders + api_orders
+        
+        # 按创建时间倒序排列（数值时间戳比较，兼容本地datetime和API返回的各种时间格式）
+        all_orders.sort(key=_CREATED_AT_TS_KEY, reverse=True)
+        
+        summary = {
+            "local_orders": len(local_orders),
+            "api_orders": len(api_orders),
+            "total_orders": len(all_orders)
+        }
+        return all_orders, summary
+    
+    async def _orders_body(self) -> bytes:
+        """订单接口的完整响应体（供聚合接口使用）"""
+        all_orders, summary = await self._collect_orders()
+        chunks, _ = _encode_orders_json(all_orders, summary)
+        return b''.join(chunks)
     
     def _setup_routes(self) -> None:
         """Setup API routes"""
         
         @self.app.get("/", response_class=HTMLResponse)
-        async def root():
+        async def root(request: Request):
             """Main dashboard page"""
-            return self._get_dashboard_html()
+            headers = {"ETag": _DASHBOARD_ETAG}
+            if request.headers.get("if-none-match") == _DASHBOARD_ETAG:
+                return Response(status_code=304, headers=headers)
+            return Response(content=_DASHBOARD_BYTES, media_type="text/html; charset=utf-8", headers=headers)
         
         @self.app.get("/api/status")
         async def get_status():
             """Get system status"""
             try:
-                status = self.trading_engine.get_system_status()
-                risk_summary = self.trading_engine.risk_manager.get_risk_summary()
-                
-                return {
-                    "status": "success",
-                    "data": {
-                        "system": status.dict(),
-                        "risk": risk_summary,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                }
+                return Response(content=self._status_body(), media_type="application/json")
             except Exception as e:
                 logger.error("获取系统状态失败", error=str(e))
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.get("/api/positions")
-        async def get_positions():
+        async def get_positions(request: Request):
             """Get active positions with detailed information"""
             try:
-                positions = []
-                
-                # 获取对冲仓位详细信息
-                strategy = getattr(self.trading_engine, 'balanced_hedge_strategy', None)
-                if strategy and hasattr(strategy, 'active_positions'):
-                    for position_id, hedge_pos in strategy.active_positions.items():
-                        # 获取验证状态信息
-                        metadata = hedge_pos.metadata if hasattr(hedge_pos, 'metadata') else {}
-                        backend_validated = metadata.get('backend_validated', None)
-                        close_validated = metadata.get('close_validated', None)
-                        
-                        position_data = {
-                            "id": position_id,
-                            "pair_id": hedge_pos.pair_id,
-                            "status": hedge_pos.status.value,
-                            "strategy": hedge_pos.strategy.value if hasattr(hedge_pos, 'strategy') else "balanced",
-                            "total_pnl": float(hedge_pos.total_pnl or 0),
-                            "created_at": hedge_pos.created_at.isoformat(),
-                            "updated_at": hedge_pos.updated_at.isoformat() if hedge_pos.updated_at else hedge_pos.created_at.isoformat(),
-                            "positions": [],
-                            "stop_loss_price": float(hedge_pos.stop_loss_price) if hasattr(hedge_pos, 'stop_loss_price') and hedge_pos.stop_loss_price else None,
-                            "take_profit_price": float(hedge_pos.take_profit_price) if hasattr(hedge_pos, 'take_profit_price') and hedge_pos.take_profit_price else None,
-                            "metadata": metadata,
-                            # 新增验证状态字段
-                            "backend_validated": backend_validated,
-                            "close_validated": close_validated,
-                            "validation_timestamp": metadata.get('validation_timestamp'),
-                            "validation_error": metadata.get('validation_error'),
-                            "price_consistency_verified": metadata.get('price_consistency_verified', False),
-                            "target_leverage": metadata.get('target_leverage', 1)
-                        }
-                        
-                        # 添加详细仓位信息
-                        for pos in hedge_pos.positions:
-                            # 计算更多详细信息
-                            leverage = getattr(pos, 'leverage', 1)
-                            margin_used = getattr(pos, 'margin_used', pos.size * pos.entry_price if pos.entry_price else 0)
-                            liquidation_price = getattr(pos, 'liquidation_price', None)
-                            margin_ratio = getattr(pos, 'margin_ratio', None)
-                            
-                            # 计算仓位价值和盈亏比例
-                            position_value = float(pos.size * pos.current_price if pos.current_price else 0)
-                            entry_value = float(pos.size * pos.entry_price if pos.entry_price else 0)
-                            pnl_percentage = 0.0
-                            if entry_value > 0:
-                                pnl_percentage = (float(pos.unrealized_pnl or 0) / entry_value) * 100
-                            
-                            position_detail = {
-                                "account_index": pos.account_index,
-                                "side": pos.side,
-                                "amount": float(pos.size),
-                                "entry_price": float(pos.entry_price) if pos.entry_price else None,
-                                "current_price": float(pos.current_price) if pos.current_price else None,
-                                "unrealized_pnl": float(pos.unrealized_pnl) if pos.unrealized_pnl else 0.0,
-                                "market_index": pos.market_index,
-                                "leverage": leverage,
-                                "margin_used": float(margin_used),
-                                "position_value": position_value,
-                                "entry_value": entry_value,
-                                "pnl_percentage": pnl_percentage,
-                                "liquidation_price": float(liquidation_price) if liquidation_price else None,
-                                "margin_ratio": float(margin_ratio) if margin_ratio else None,
-                                "created_at": pos.created_at.isoformat(),
-                                "updated_at": pos.updated_at.isoformat() if pos.updated_at else pos.created_at.isoformat()
-                            }
-                            position_data["positions"].append(position_detail)
-                        
-                        positions.append(position_data)
-                
-                return {
-                    "status": "success",
-                    "data": positions
-                }
+                body, etag = self._positions_body()
+                return self._etag_response(body, etag, request)
             except Exception as e:
                 logger.error("获取仓位信息失败", error=str(e))
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.get("/api/accounts")
-        async def get_accounts():
+        async def get_accounts(request: Request):
             """Get account information"""
             try:
-                accounts = []
-                for account in self.trading_engine.account_manager.accounts.values():
-                    accounts.append({
-                        "index": account.index,
-                        "l1_address": account.l1_address,
-                        "balance": float(account.balance),
-                        "available_balance": float(account.available_balance),
-                        "positions_count": len(account.positions),
-                        "is_active": account.is_active,
-                        "last_updated": account.last_updated.isoformat()
-                    })
-                
-                return {
-                    "status": "success",
-                    "data": accounts
-                }
+                body, etag = self._accounts_body()
+                return self._etag_response(body, etag, request)
             except Exception as e:
                 logger.error("获取账户信息失败", error=str(e))
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.get("/api/trading-pairs")
-        async def get_trading_pairs():
+        async def get_trading_pairs(request: Request):
             """Get trading pairs"""
             try:
-                pairs = []
-                for pair in self.trading_engine.trading_pairs.values():
-                    pairs.append({
-                        "id": pair.id,
-                        "name": pair.name,
-                        "market_index": pair.market_index,
-                        "is_enabled": pair.is_enabled,
-                        "leverage": pair.leverage,
-                        "max_positions": pair.max_positions,
-                        "cooldown_minutes": pair.cooldown_minutes,
-                        "hedge_strategy": pair.hedge_strategy.value
-                    })
-                
-                return {
-                    "status": "success",
-                    "data": pairs
-                }
+                body, etag = self._trading_pairs_body()
+                return self._etag_response(body, etag, request)
             except Exception as e:
                 logger.error("获取交易对信息失败", error=str(e))
                 raise HTTPException(status_code=500, detail=str(e))
@@ -209,6 +578,7 @@ class WebServer:
         async def start_engine():
             """Start trading engine"""
             try:
+                self._response_cache.clear()
                 if not self.trading_engine.is_running:
                     await self.trading_engine.start()
                     return {"status": "success", "message": "交易引擎已启动"}
@@ -222,6 +592,7 @@ class WebServer:
         async def stop_engine():
             """Stop trading engine"""
             try:
+                self._response_cache.clear()
                 if self.trading_engine.is_running:
                     await self.trading_engine.stop()
                     return {"status": "success", "message": "交易引擎已停止"}
@@ -232,120 +603,17 @@ class WebServer:
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.get("/api/orders")
-        async def get_orders():
+        async def get_orders(request: Request):
             """Get order information from both local cache and Lighter API"""
             try:
-                local_orders = []
-                api_orders = []
-                order_manager = getattr(self.trading_engine, 'order_manager', None)
-                
-                # 获取本地缓存的订单
-                if order_manager and hasattr(order_manager, 'orders'):
-                    for order_id, order in order_manager.orders.items():
-                        order_data = {
-                            "id": order_id,
-                            "account_index": order.account_index,
-                            "market_index": order.market_index,
-                            "order_type": order.order_type,
-                            "side": order.side,
-                            "amount": float(order.amount),
-                            "price": float(order.price),
-                            "status": order.status.value,
-                            "created_at": order.created_at.isoformat(),
-                            "filled_amount": float(order.filled_amount) if order.filled_amount else 0.0,
-                            "filled_price": float(order.filled_price) if order.filled_price else None,
-                            "filled_at": order.filled_at.isoformat() if order.filled_at else None,
-                            "cancelled_at": order.cancelled_at.isoformat() if hasattr(order, 'cancelled_at') and order.cancelled_at else None,
-                            "sdk_order_id": order.sdk_order_id,
-                            "metadata": order.metadata if hasattr(order, 'metadata') else {},
-                            "source": "local_cache"
-                        }
-                        local_orders.append(order_data)
-                
-                # 获取API中的订单历史
-                if order_manager:
-                    try:
-                        # 获取所有活跃账户的订单
-                        config_manager = getattr(order_manager, 'config_manager', None)
-                        if config_manager:
-                            active_accounts = config_manager.get_active_accounts()
-                            
-                            for account in active_accounts:
-                                try:
-                                    # 获取账户的所有订单（活跃+历史）
-                                    account_orders = await order_manager.get_all_account_orders_from_api(account.index)
-                                    
-                                    # 处理活跃订单
-                                    for api_order in account_orders.get('active_orders', []):
-                                        order_data = {
-                                            "id": f"api_active_{account.index}_{api_order.get('id', 'unknown')}",
-                                            "account_index": account.index,
-                                            "market_index": api_order.get('market_id', 0),
-                                            "order_type": api_order.get('order_type', 'unknown'),
-                                            "side": api_order.get('side', 'unknown'),
-                                            "amount": float(api_order.get('amount', 0)),
-                                            "price": float(api_order.get('price', 0)),
-                                            "status": api_order.get('status', 'unknown'),
-                                            "created_at": api_order.get('created_at', 'unknown'),
-                                            "filled_amount": float(api_order.get('filled_amount', 0)),
-                                            "filled_price": float(api_order.get('filled_price', 0)) if api_order.get('filled_price') else None,
-                                            "filled_at": api_order.get('filled_at'),
-                                            "cancelled_at": api_order.get('cancelled_at'),
-                                            "sdk_order_id": api_order.get('id'),
-                                            "metadata": api_order,
-                                            "source": "api_active"
-                                        }
-                                        api_orders.append(order_data)
-                                    
-                                    # 处理历史订单
-                                    for api_order in account_orders.get('inactive_orders', []):
-                                        order_data = {
-                                            "id": f"api_inactive_{account.index}_{api_order.get('id', 'unknown')}",
-                                            "account_index": account.index,
-                                            "market_index": api_order.get('market_id', 0),
-                                            "order_type": api_order.get('order_type', 'unknown'),
-                                            "side": api_order.get('side', 'unknown'),
-                                            "amount": float(api_order.get('amount', 0)),
-                                            "price": float(api_order.get('price', 0)),
-                                            "status": api_order.get('status', 'unknown'),
-                                            "created_at": api_order.get('created_at', 'unknown'),
-                                            "filled_amount": float(api_order.get('filled_amount', 0)),
-                                            "filled_price": float(api_order.get('filled_price', 0)) if api_order.get('filled_price') else None,
-                                            "filled_at": api_order.get('filled_at'),
-                                            "cancelled_at": api_order.get('cancelled_at'),
-                                            "sdk_order_id": api_order.get('id'),
-                                            "metadata": api_order,
-                                            "source": "api_inactive"
-                                        }
-                                        api_orders.append(order_data)
-                                        
-                                except Exception as account_error:
-                                    logger.warning("获取账户订单失败", 
-                                                  account_index=account.index, 
-                                                  error=str(account_error))
-                    
-                    except Exception as api_error:
-                        logger.warning("从API获取订单失败", error=str(api_error))
-                
-                # 合并所有订单
-                all_orders = local_orders + api_orders
-                
-                # 按创建时间倒序排列
-                try:
-                    all_orders.sort(key=lambda x: x['created_at'], reverse=True)
-                except:
-                    # 如果排序失败，至少保证有数据返回
-                    pass
-                
-                return {
-                    "status": "success",
-                    "data": all_orders,
-                    "summary": {
-                        "local_orders": len(local_orders),
-                        "api_orders": len(api_orders),
-                        "total_orders": len(all_orders)
-                    }
-                }
+                all_orders, summary = await self._collect_orders()
+                
+                # 订单可能有数千条：分块编码并计算ETag，内容未变化时返回304
+                chunks, etag = _encode_orders_json(all_orders, summary)
+                headers = {"ETag": etag}
+                if request.headers.get("if-none-match") == etag:
+                    return Response(status_code=304, headers=headers)
+                return Response(b"".join(chunks), media_type="application/json", headers=headers)
             except Exception as e:
                 logger.error("获取订单信息失败", error=str(e))
                 raise HTTPException(status_code=500, detail=str(e))
@@ -370,6 +638,7 @@ class WebServer:
                     reason="manual_close", 
                     force_close=True
                 )
+                self._response_cache.pop("positions", None)
                 
                 if success:
                     logger.info("手动平仓成功", position_id=position_id)
@@ -418,16 +687,18 @@ class WebServer:
                 closed_positions = []
                 failed_positions = []
                 
-                # 并行平仓所有仓位
-                import asyncio
+                # 并行平仓所有仓位，限制同时进行的平仓数量，避免触发交易所限流
+                max_concurrent_closes = self.config_manager.get_web_config().get('max_concurrent_closes', 8)
+                close_semaphore = asyncio.Semaphore(max_concurrent_closes)
                 
                 async def close_single_position(pos_id, hedge_pos):
                     try:
-                        success = await strategy.close_hedge_position(
-                            hedge_pos, 
-                            reason="manual_close_all", 
-                            force_close=True
-                        )
+                        async with close_semaphore:
+                            success = await strategy.close_hedge_position(
+                                hedge_pos, 
+                                reason="manual_close_all", 
+                                force_close=True
+                            )
                         return pos_id, success, None
                     except Exception as e:
                         return pos_id, False, str(e)
@@ -440,6 +711,7 @@ class WebServer:
                 
                 # 执行并发平仓
                 results = await asyncio.gather(*tasks, return_exceptions=True)
+                self._response_cache.pop("positions", None)
                 
                 # 处理结果
                 for result in results:
@@ -555,6 +827,7 @@ class WebServer:
                                        error=str(pos_error))
                 
                 total_processed = len(closed_positions) + len(failed_positions)
+                self._response_cache.pop("positions", None)
                 
                 logger.info("强制平仓所有交易所仓位完成", 
                            closed_count=len(closed_positions),
@@ -574,37 +847,72 @@ class WebServer:
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.get("/api/market-data")
-        async def get_market_data():
+        async def get_market_data(request: Request):
             """Get market data"""
             try:
-                market_data = {}
+                body, etag = self._market_data_body()
+                return self._etag_response(body, etag, request)
+            except Exception as e:
+                logger.error("获取市场数据失败", error=str(e))
+                raise HTTPException(status_code=500, detail=str(e))
+        
+        @self.app.get("/api/dashboard")
+        async def get_dashboard(request: Request, markets: bool = True):
+            """仪表盘聚合接口：一次请求返回各面板数据，每个字段与对应子接口的响应体一致"""
+            try:
+                async def sync_section(build):
+                    return build()
+                
+                sections = [
+                    ("status", sync_section(self._status_body)),
+                    ("accounts", sync_section(self._accounts_body)),
+                    ("trading_pairs", sync_section(self._trading_pairs_body)),
+                    ("positions", sync_section(self._positions_body)),
+                    ("orders", self._orders_body()),
+                ]
+                # 行情推送连接正常时前端传markets=false，不再重复返回行情
+                if markets:
+                    sections.append(("market_data", sync_section(self._market_data_body)))
                 
-                # 获取WebSocket管理器的市场数据
-                ws_manager = getattr(self.trading_engine, 'ws_manager', None)
-                if ws_manager and hasattr(ws_manager, 'latest_market_data'):
-                    for market_index, data in ws_manager.latest_market_data.items():
-                        market_data[market_index] = {
-                            "market_index": market_index,
-                            "price": float(data.price) if data.price else None,
-                            "bid_price": float(data.bid_price) if data.bid_price else None,
-                            "ask_price": float(data.ask_price) if data.ask_price else None,
-                            "volume": float(data.volume) if data.volume else None,
-                            "timestamp": data.timestamp.isoformat() if data.timestamp else None
-                        }
+                results = await asyncio.gather(*(coro for _, coro in sections), return_exceptions=True)
                 
-                return {
-                    "status": "success",
-                    "data": market_data
-                }
+                # 各子响应体已是JSON字节，直接拼接；单个面板失败时只该字段返回错误
+                parts = []
+                for (name, _), result in zip(sections, results):
+                    if isinstance(result, Exception):
+                        logger.error("获取仪表盘数据失败", section=name, error=str(result))
+                        result = orjson.dumps({"status": "error", "message": str(result)})
+                    elif isinstance(result, tuple):
+                        result = result[0]
+                    parts.append(b'"' + name.encode() + b'":' + result)
+                body = b'{"status":"success","data":{' + b','.join(parts) + b'}}'
+                etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+                return self._etag_response(body, etag, request)
             except Exception as e:
-                logger.error("获取市场数据失败", error=str(e))
+                logger.error("获取仪表盘数据失败", error=str(e))
                 raise HTTPException(status_code=500, detail=str(e))
         
+        @self.app.get("/api/stream")
+        async def stream():
+            """实时推送行情更新（Server-Sent Events）"""
+            queue: asyncio.Queue = asyncio.Queue(maxsize=_STREAM_QUEUE_MAXSIZE)
+            self._stream_queues.add(queue)
+            # 事件流不能被gzip缓冲，显式声明不压缩
+            return StreamingResponse(
+                self._stream_events(queue),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "Content-Encoding": "identity"}
+            )
+        
         @self.app.get("/api/config")
-        async def get_config():
+        async def get_config(request: Request):
             """Get system configuration"""
             try:
-                return {
+                cached = self._get_cached_response("config", request)
+                if cached is not None:
+                    return cached
+                
+                return self._cache_response("config", {
                     "status": "success",
                     "data": {
                         "global": self.config_manager.get_global_config(),
@@ -613,391 +921,14 @@ class WebServer:
                         "accounts_count": len(self.config_manager.get_accounts()),
                         "pairs_count": len(self.config_manager.get_trading_pairs())
                     }
-                }
+                }, _CONFIG_CACHE_TTL_SECONDS, request)
             except Exception as e:
                 logger.error("获取配置信息失败", error=str(e))
                 raise HTTPException(status_code=500, detail=str(e))
     
-    def _get_dashboard_html(self) -> str:
-        """Generate dashboard HTML"""
-        return """
-        <!DOCTYPE html>
-        <html lang="zh-CN">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Lighter 对冲交易系统</title>
-            <style>
-                body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; margin: 0; padding: 20px; background: #f5f5f5; }
-                .container { max-width: 1200px; margin: 0 auto; }
-                .header { background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 20px; }
-                .card { background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 20px; }
-                .status { display: inline-block; padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: bold; }
-                .status.running { background: #d4edda; color: #155724; }
-                .status.stopped { background: #f8d7da; color: #721c24; }
-                .grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; }
-                button { background: #007bff; color: white; border: none; padding: 10px 20px; border-radius: 4px; cursor: pointer; }
-                button:hover { background: #0056b3; }
-                .table { width: 100%; border-collapse: collapse; }
-                .table th, .table td { padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }
-                .refresh-btn { float: right; background: #28a745; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🚀 Lighter 对冲交易系统</h1>
-                    <p>实时监控和管理您的对冲交易策略</p>
-                    <button class="refresh-btn" onclick="location.reload()">🔄 刷新</button>
-                </div>
-                
-                <div class="grid">
-                    <div class="card">
-                        <h3>📊 系统状态</h3>
-                        <div id="system-status">加载中...</div>
-                    </div>
-                    
-                    <div class="card">
-                        <h3>💰 账户概览</h3>
-                        <div id="accounts-overview">加载中...</div>
-                    </div>
-                    
-                    <div class="card">
-                        <h3>📈 市场数据</h3>
-                        <div id="market-data">加载中...</div>
-                    </div>
-                    
-                    <div class="card">
-                        <h3>⚖️ 交易对</h3>
-                        <div id="trading-pairs">加载中...</div>
-                    </div>
-                </div>
-                
-                <div class="card">
-                    <h3>🎯 对冲仓位详情</h3>
-                    <div id="hedge-positions">加载中...</div>
-                </div>
-                
-                <div class="card">
-                    <h3>📋 订单记录</h3>
-                    <div id="orders-list">加载中...</div>
-                </div>
-                
-                <div class="card">
-                    <h3>🎛️ 控制面板</h3>
-                    <button onclick="startEngine()">▶️ 启动引擎</button>
-                    <button onclick="stopEngine()">⏹️ 停止引擎</button>
-                    <button onclick="refreshData()">🔄 刷新数据</button>
-                    <br><br>
-                    <h4>🛑 平仓操作</h4>
-                    <button onclick="closeAllPositions()" style="background: #ffc107; color: #000;">📊 平仓对冲仓位</button>
-                    <button onclick="forceCloseAllPositions()" style="background: #dc3545; margin-left: 10px;">⚠️ 强制平仓所有仓位</button>
-                </div>
-            </div>
-            
-            <script>
-                async function fetchData(endpoint) {
-                    try {
-                        const response = await fetch('/api/' + endpoint);
-                        const data = await response.json();
-                        return data;
-                    } catch (error) {
-                        console.error('Error fetching ' + endpoint + ':', error);
-                        return null;
-                    }
-                }
-                
-                async function updateSystemStatus() {
-                    const data = await fetchData('status');
-                    if (data && data.status === 'success') {
-                        const system = data.data.system;
-                        document.getElementById('system-status').innerHTML = `
-                            <p><strong>状态:</strong> <span class="status ${system.is_running ? 'running' : 'stopped'}">${system.is_running ? '运行中' : '已停止'}</span></p>
-                            <p><strong>活跃仓位:</strong> ${system.active_positions}</p>
-                            <p><strong>账户总数:</strong> ${system.total_accounts}</p>
-                            <p><strong>启用交易对:</strong> ${system.active_pairs}</p>
-                        `;
-                    }
-                }
-                
-                async function updateAccounts() {
-                    const data = await fetchData('accounts');
-                    if (data && data.status === 'success') {
-                        let html = '<table class="table"><tr><th>账户</th><th>余额</th><th>状态</th></tr>';
-                        data.data.forEach(account => {
-                            html += `<tr>
-                                <td>${account.index}</td>
-                                <td>${account.balance.toFixed(2)}</td>
-                                <td><span class="status ${account.is_active ? 'running' : 'stopped'}">${account.is_active ? '活跃' : '非活跃'}</span></td>
-                            </tr>`;
-                        });
-                        html += '</table>';
-                        document.getElementById('accounts-overview').innerHTML = html;
-                    }
-                }
-                
-                async function updateHedgePositions() {
-                    const data = await fetchData('positions');
-                    if (data && data.status === 'success') {
-                        if (data.data.length === 0) {
-                            document.getElementById('hedge-positions').innerHTML = '<p>暂无对冲仓位</p>';
-                        } else {
-                            let html = '';
-                            data.data.forEach(hedgePos => {
-                                // 验证状态显示
-                                let validationStatus = '';
-                                if (hedgePos.backend_validated !== null) {
-                                    if (hedgePos.backend_validated) {
-                                        validationStatus = '<span style="color: green;">✅ 后端验证通过</span>';
-                                    } else {
-                                        validationStatus = '<span style="color: red;">❌ 后端验证失败</span>';
-                                    }
-                                }
-                                
-                                if (hedgePos.close_validated !== null) {
-                                    if (hedgePos.close_validated) {
-                                        validationStatus += ' <span style="color: green;">✅ 平仓验证通过</span>';
-                                    } else {
-                                        validationStatus += ' <span style="color: orange;">⚠️ 平仓待验证</span>';
-                                    }
-                                }
-                                
-                                html += `
-                                    <div style="border: 1px solid #ddd; margin: 10px 0; padding: 15px; border-radius: 5px;">
-                                        <h4>🎯 ${hedgePos.pair_id} - ${hedgePos.id.substring(0, 12)}...</h4>
-                                        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 10px; margin: 10px 0;">
-                                            <div><strong>状态:</strong> <span class="status ${hedgePos.status === 'active' ? 'running' : 'stopped'}">${hedgePos.status}</span></div>
-                                            <div><strong>策略:</strong> ${hedgePos.strategy}</div>
-                                            <div><strong>总盈亏:</strong> <span style="color: ${hedgePos.total_pnl >= 0 ? 'green' : 'red'}">${hedgePos.total_pnl.toFixed(2)}</span></div>
-                                            <div><strong>杠杆倍数:</strong> ${hedgePos.target_leverage}x</div>
-                                            <div><strong>创建时间:</strong> ${new Date(hedgePos.created_at).toLocaleString()}</div>
-                                        </div>
-                                        
-                                        ${validationStatus ? `<div style="margin: 10px 0; padding: 8px; background: #f8f9fa; border-radius: 4px;"><strong>🔍 验证状态:</strong> ${validationStatus}</div>` : ''}
-                                        
-                                        ${hedgePos.price_consistency_verified ? '<div style="color: green;">✅ 价格一致性验证通过</div>' : '<div style="color: orange;">⚠️ 价格一致性待验证</div>'}
-                                        
-                                        ${hedgePos.stop_loss_price ? `<div><strong>🛡️ 止损价格:</strong> ${hedgePos.stop_loss_price.toFixed(2)}</div>` : ''}
-                                        ${hedgePos.take_profit_price ? `<div><strong>🎯 止盈价格:</strong> ${hedgePos.take_profit_price.toFixed(2)}</div>` : ''}
-                                        
-                                        <div style="margin-top: 10px;">
-                                            <strong>📊 子仓位:</strong>
-                                            <table class="table" style="margin-top: 5px;">
-                                                <tr><th>账户</th><th>方向</th><th>数量</th><th>开仓价</th><th>当前价</th><th>盈亏</th></tr>
-                                                ${hedgePos.positions.map(pos => `
-                                                    <tr>
-                                                        <td>${pos.account_index}</td>
-                                                        <td><span style="color: ${pos.side === 'buy' ? 'green' : 'red'}">${pos.side.toUpperCase()}</span></td>
-                                                        <td>${pos.amount.toFixed(2)}</td>
-                                                        <td>${pos.entry_price ? pos.entry_price.toFixed(2) : '待更新'}</td>
-                                                        <td>${pos.current_price ? pos.current_price.toFixed(2) : '待更新'}</td>
-                                                        <td style="color: ${pos.unrealized_pnl >= 0 ? 'green' : 'red'}">${pos.unrealized_pnl.toFixed(2)}</td>
-                                                    </tr>
-                                                `).join('')}
-                                            </table>
-                                        </div>
-                                    </div>
-                                `;
-                            });
-                            document.getElementById('hedge-positions').innerHTML = html;
-                        }
-                    }
-                }
-                
-                async function updateMarketData() {
-                    const data = await fetchData('market-data');
-                    if (data && data.status === 'success') {
-                        const markets = Object.values(data.data);
-                        if (markets.length === 0) {
-                            document.getElementById('market-data').innerHTML = '<p>暂无市场数据</p>';
-                        } else {
-                            let html = '<table class="table"><tr><th>市场</th><th>价格</th><th>买价</th><th>卖价</th><th>更新时间</th></tr>';
-                            markets.forEach(market => {
-                                const updateTime = market.timestamp ? new Date(market.timestamp).toLocaleTimeString() : '未知';
-                                html += `<tr>
-                                    <td>市场 ${market.market_index}</td>
-                                    <td><strong>${market.price ? market.price.toFixed(2) : '待更新'}</strong></td>
-                                    <td>${market.bid_price ? market.bid_price.toFixed(2) : '待更新'}</td>
-                                    <td>${market.ask_price ? market.ask_price.toFixed(2) : '待更新'}</td>
-                                    <td>${updateTime}</td>
-                                </tr>`;
-                            });
-                            html += '</table>';
-                            document.getElementById('market-data').innerHTML = html;
-                        }
-                    }
-                }
-                
-                async function updateOrdersList() {
-                    const data = await fetchData('orders');
-                    if (data && data.status === 'success') {
-                        if (data.data.length === 0) {
-                            document.getElementById('orders-list').innerHTML = '<p>暂无订单记录</p>';
-                        } else {
-                            // 按状态分组
-                            const pendingOrders = data.data.filter(o => o.status === 'pending');
-                            const filledOrders = data.data.filter(o => o.status === 'filled');
-                            const failedOrders = data.data.filter(o => o.status === 'failed' || o.status === 'cancelled');
-                            
-                            let html = '';
-                            
-                            if (pendingOrders.length > 0) {
-                                html += '<h4>⏳ 待处理订单</h4>';
-                                html += '<table class="table"><tr><th>订单ID</th><th>账户</th><th>方向</th><th>数量</th><th>价格</th><th>创建时间</th></tr>';
-                                pendingOrders.slice(0, 10).forEach(order => {
-                                    html += `<tr>
-                                        <td>${order.id.substring(0, 15)}...</td>
-                                        <td>${order.account_index}</td>
-                                        <td><span style="color: ${order.side === 'buy' ? 'green' : 'red'}">${order.side.toUpperCase()}</span></td>
-                                        <td>${order.amount.toFixed(2)}</td>
-                                        <td>${order.price.toFixed(2)}</td>
-                                        <td>${new Date(order.created_at).toLocaleString()}</td>
-                                    </tr>`;
-                                });
-                                html += '</table>';
-                            }
-                            
-                            if (filledOrders.length > 0) {
-                                html += '<h4>✅ 已成交订单 (最近10个)</h4>';
-                                html += '<table class="table"><tr><th>订单ID</th><th>账户</th><th>方向</th><th>数量</th><th>成交价</th><th>成交时间</th></tr>';
-                                filledOrders.slice(0, 10).forEach(order => {
-                                    html += `<tr>
-                                        <td>${order.id.substring(0, 15)}...</td>
-                                        <td>${order.account_index}</td>
-                                        <td><span style="color: ${order.side === 'buy' ? 'green' : 'red'}">${order.side.toUpperCase()}</span></td>
-                                        <td>${order.filled_amount.toFixed(2)}</td>
-                                        <td>${order.filled_price ? order.filled_price.toFixed(2) : order.price.toFixed(2)}</td>
-                                        <td>${order.filled_at ? new Date(order.filled_at).toLocaleString() : '未知'}</td>
-                                    </tr>`;
-                                });
-                                html += '</table>';
-                            }
-                            
-                            if (failedOrders.length > 0) {
-                                html += '<h4>❌ 失败/取消订单 (最近5个)</h4>';
-                                html += '<table class="table"><tr><th>订单ID</th><th>账户</th><th>方向</th><th>状态</th><th>创建时间</th></tr>';
-                                failedOrders.slice(0, 5).forEach(order => {
-                                    html += `<tr>
-                                        <td>${order.id.substring(0, 15)}...</td>
-                                        <td>${order.account_index}</td>
-                                        <td><span style="color: ${order.side === 'buy' ? 'green' : 'red'}">${order.side.toUpperCase()}</span></td>
-                                        <td><span class="status stopped">${order.status}</span></td>
-                                        <td>${new Date(order.created_at).toLocaleString()}</td>
-                                    </tr>`;
-                                });
-                                html += '</table>';
-                            }
-                            
-                            document.getElementById('orders-list').innerHTML = html;
-                        }
-                    }
-                }
-                
-                async function updateTradingPairs() {
-                    const data = await fetchData('trading-pairs');
-                    if (data && data.status === 'success') {
-                        let html = '<table class="table"><tr><th>交易对</th><th>状态</th><th>策略</th></tr>';
-                        data.data.forEach(pair => {
-                            html += `<tr>
-                                <td>${pair.name}</td>
-                                <td><span class="status ${pair.is_enabled ? 'running' : 'stopped'}">${pair.is_enabled ? '启用' : '禁用'}</span></td>
-                                <td>${pair.hedge_strategy}</td>
-                            </tr>`;
-                        });
-                        html += '</table>';
-                        document.getElementById('trading-pairs').innerHTML = html;
-                    }
-                }
-                
-                async function startEngine() {
-                    try {
-                        const response = await fetch('/api/engine/start', { method: 'POST' });
-                        const result = await response.json();
-                        alert(result.message);
-                        refreshData();
-                    } catch (error) {
-                        alert('启动失败: ' + error.message);
-                    }
-                }
-                
-                async function stopEngine() {
-                    try {
-                        const response = await fetch('/api/engine/stop', { method: 'POST' });
-                        const result = await response.json();
-                        alert(result.message);
-                        refreshData();
-                    } catch (error) {
-                        alert('停止失败: ' + error.message);
-                    }
-                }
-                
-                async function closeAllPositions() {
-                    if (!confirm('确定要平仓所有对冲仓位吗？此操作不可撤销！')) {
-                        return;
-                    }
-                    
-                    try {
-                        const response = await fetch('/api/positions/close-all', { method: 'POST' });
-                        const result = await response.json();
-                        
-                        if (result.status === 'completed') {
-                            alert(`平仓完成！\\n成功: ${result.closed_positions.length} 个\\n失败: ${result.failed_positions.length} 个`);
-                        } else {
-                            alert(result.message || '平仓操作完成');
-                        }
-                        
-                        refreshData();
-                    } catch (error) {
-                        alert('平仓失败: ' + error.message);
-                    }
-                }
-                
-                async function forceCloseAllPositions() {
-                    if (!confirm('⚠️ 警告：确定要强制平仓所有交易所仓位吗？\\n这将清理所有账户的所有仓位，包括非对冲仓位！\\n此操作不可撤销！')) {
-                        return;
-                    }
-                    
-                    if (!confirm('⚠️ 最后确认：您真的要执行强制平仓所有仓位吗？')) {
-                        return;
-                    }
-                    
-                    try {
-                        const response = await fetch('/api/positions/force-close-all', { method: 'POST' });
-                        const result = await response.json();
-                        
-                        if (result.status === 'completed') {
-                            alert(`强制平仓完成！\\n成功: ${result.closed_positions.length} 个账户\\n失败: ${result.failed_positions.length} 个账户`);
-                        } else {
-                            alert(result.message || '强制平仓操作完成');
-                        }
-                        
-                        refreshData();
-                    } catch (error) {
-                        alert('强制平仓失败: ' + error.message);
-                    }
-                }
-                
-                async function refreshData() {
-                    await updateSystemStatus();
-                    await updateAccounts();
-                    await updateMarketData();
-                    await updateTradingPairs();
-                    await updateHedgePositions();
-                    await updateOrdersList();
-                }
-                
-                // Initialize dashboard
-                refreshData();
-                
-                // Auto refresh every 10 seconds
-                setInterval(refreshData, 10000);
-            </script>
-        </body>
-        </html>
-        """
-    
     async def initialize(self) -> None:
         """Initialize web server"""
+        self.trading_engine.websocket_manager.add_market_data_callback(self._on_market_data)
         logger.info("Web服务器初始化完成")
     
     async def start(self) -> None:
@@ -1007,15 +938,23 @@ class WebServer:
             port = web_config.get('port', 3000)
             host = web_config.get('host', '0.0.0.0')
             
+            # 服务器运行在交易引擎所在的事件循环中（uvloop由main在启动前安装），
+            # 这里只调整连接相关参数
             config = uvicorn.Config(
                 app=self.app,
                 host=host,
                 port=port,
-                log_level="info"
+                log_level="info",
+                # http="auto" 在安装了httptools时自动使用C解析器；逐请求访问日志默认关闭
+                http="auto",
+                access_log=web_config.get('access_log', False),
+                limit_concurrency=web_config.get('limit_concurrency', 256),
+                backlog=web_config.get('backlog', 2048)
             )
             
             self.server = uvicorn.Server(config)
             self.server_task = asyncio.create_task(self.server.serve())
+            self._stream_flush_task = asyncio.create_task(self._flush_market_ticks())
             
             logger.info("Web服务器已启动", host=host, port=port)
             
@@ -1026,9 +965,14 @@ class WebServer:
     async def cleanup(self) -> None:
         """Cleanup web server"""
         try:
+            self.trading_engine.websocket_manager.remove_market_data_callback(self._on_market_data)
+            
             if self.server:
                 self.server.should_exit = True
             
+            if self._stream_flush_task:
+                self._stream_flush_task.cancel()
+            
             if self.server_task:
                 self.server_task.cancel()
                 try:
@@ -6,6 +6,7 @@ import asyncio
 import sys
 import lighter
 from decimal import Decimal
+from src.utils.event_loop import install_uvloop
 
 async def test_sl_tp_api():
     """测试止盈止损API方法是否存在"""
@@ -17,26 +18,23 @@ async def test_sl_tp_api():
         print("测试Lighter SDK止盈止损API方法...")
         print()
         
-        # 创建API客户端
-        api_client = lighter.ApiClient(lighter.Configuration(host="https://mainnet.zklighter.elliot.ai"))
-        
         # 检查是否有SignerClient类
         try:
             from lighter import SignerClient
             print("✓ SignerClient类存在")
             
-            # 检查SignerClient的方法
-            methods = [method for method in dir(SignerClient) if not method.startswith('_')]
+            # 检查SignerClient的方法（只扫描一次类属性，后续检查复用该集合）
+            methods = frozenset(method for method in dir(SignerClient) if not method.startswith('_'))
             print(f"SignerClient可用方法: {len(methods)}个")
             
             # 检查止盈止损相关方法
-            sl_tp_methods = [method for method in methods if 'sl_' in method or 'tp_' in method or 'stop' in method or 'take' in method]
+            sl_tp_methods = sorted(method for method in methods if any(keyword in method for keyword in ('sl_', 'tp_', 'stop', 'take')))
             print(f"止盈止损相关方法: {sl_tp_methods}")
             
             # 检查具体的方法
             required_methods = ['create_sl_order', 'create_tp_order', 'create_sl_limit_order', 'create_tp_limit_order']
             for method in required_methods:
-                if hasattr(SignerClient, method):
+                if method in methods:
                     print(f"✓ {method} 方法存在")
                 else:
                     print(f"✗ {method} 方法不存在")
@@ -46,8 +44,8 @@ async def test_sl_tp_api():
         
         # 检查OrderApi的方法
         try:
-            order_api = lighter.OrderApi(api_client)
-            methods = [method for method in dir(order_api) if not method.startswith('_')]
+            # 方法都定义在生成的API类上，直接读取类字典，不再对实例做dir()扫描和排序
+            methods = sorted(method for method in vars(lighter.OrderApi) if not method.startswith('_'))
             print(f"\nOrderApi可用方法: {len(methods)}个")
             
             # 查找订单相关方法
@@ -66,8 +64,8 @@ async def test_sl_tp_api():
             for api_class_name in api_classes:
                 try:
                     api_class = getattr(lighter, api_class_name)
-                    api_instance = api_class(api_client)
-                    methods = [method for method in dir(api_instance) if not method.startswith('_') and callable(getattr(api_instance, method))]
+                    # 从类字典一次取出公开的可调用属性，无需为每个类创建实例
+                    methods = sorted(name for name, attr in vars(api_class).items() if not name.startswith('_') and callable(attr))
                     
                     # 查找止盈止损相关方法
                     sl_tp_methods = [method for method in methods if any(keyword in method.lower() for keyword in ['sl_', 'tp_', 'stop', 'take', 'profit', 'loss'])]
@@ -87,4 +85,5 @@ async def test_sl_tp_api():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(test_sl_tp_api())
\ No newline at end of file
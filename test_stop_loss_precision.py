@@ -4,7 +4,7 @@
 """
 import sys
 import yaml
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_EVEN
 
 def test_stop_loss_precision():
     """测试止盈止损精度计算"""
@@ -63,8 +63,9 @@ def test_stop_loss_precision():
     
     # 精度转换测试
     base_amount = int(position_amount * size_multiplier)
-    sl_trigger_price_int = int(sl_trigger_price * price_multiplier)
-    tp_trigger_price_int = int(tp_trigger_price * price_multiplier)
+    # 与OrderManager一致：触发价格按最近值取整，避免向零截断带来的单位偏差
+    sl_trigger_price_int = int((sl_trigger_price * price_multiplier).to_integral_value(rounding=ROUND_HALF_EVEN))
+    tp_trigger_price_int = int((tp_trigger_price * price_multiplier).to_integral_value(rounding=ROUND_HALF_EVEN))
     
     print(f"  转换后的数量: {base_amount}")
     print(f"  转换后的止损价格: {sl_trigger_price_int}")
@@ -90,7 +91,8 @@ def test_stop_loss_precision():
     print(f"  精度损失: {abs(position_amount - recovered_amount)}")
     
     # 检查精度损失是否在可接受范围内
-    max_acceptable_price_loss = Decimal("0.001")  # 0.001 SOL
+    # 最近值取整后价格误差不超过半个最小价格单位
+    max_acceptable_price_loss = Decimal(1) / (2 * price_multiplier)  # 0.0005 SOL
     max_acceptable_amount_loss = Decimal("0.001")  # 0.001 个SOL
     
     sl_price_loss = abs(sl_trigger_price - recovered_sl_price)